@@ -0,0 +1,191 @@
+"""
+JurisConta - Cache de Resultados
+Cache persistente em SQLite compartilhado entre processos locais (workers do
+app web). As chaves incluem as entradas do cálculo e o hash do banco de
+feriados, de modo que qualquer alteração no feriados.json invalida o cache.
+
+Apenas o início da contagem e o vencimento são armazenados; dias restantes e
+status dependem da data de hoje e são recalculados a cada consulta.
+
+Cálculos em lote não passam pelo cache: prazos.calcular_lote, com um calendário
+compilado por jurisdição, é mais rápido do que a consulta ao SQLite.
+"""
+
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+import prazos
+
+LIMITE_PADRAO = 200_000
+
+# Operações acumuladas em memória antes de gravar contadores e checar o limite
+LOTE_ESCRITA = 100
+
+
+class CachePrazos:
+    """Cache de calcular_prazo em SQLite, com despejo por tamanho (LRU aproximado)"""
+
+    def __init__(self, caminho_db: str, caminho_feriados: str = prazos.ARQUIVO_FERIADOS,
+                 limite_entradas: int = LIMITE_PADRAO):
+        self.caminho_db = caminho_db
+        self.caminho_feriados = caminho_feriados
+        self.limite_entradas = limite_entradas
+        self.acertos = 0
+        self.falhas = 0
+        self._pendentes = {'acertos': 0, 'falhas': 0}
+        self._insercoes = 0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._assinatura: Optional[Tuple[int, int]] = None
+        self.versao = ''
+        self.feriados: Dict = {}
+        self._inicializar()
+        self._verificar_feriados()
+
+    def _conexao(self) -> sqlite3.Connection:
+        """Uma conexão por thread; o SQLite cuida da concorrência entre processos"""
+        conexao = getattr(self._local, 'conexao', None)
+        if conexao is None:
+            conexao = sqlite3.connect(self.caminho_db, timeout=30, isolation_level=None)
+            conexao.execute('PRAGMA journal_mode=WAL')
+            conexao.execute('PRAGMA synchronous=NORMAL')
+            self._local.conexao = conexao
+        return conexao
+
+    def _inicializar(self):
+        conexao = self._conexao()
+        conexao.execute("""
+            CREATE TABLE IF NOT EXISTS prazos (
+                chave TEXT PRIMARY KEY,
+                versao TEXT NOT NULL,
+                data_inicio TEXT NOT NULL,
+                data_vencimento TEXT NOT NULL,
+                ultimo_acesso REAL NOT NULL
+            )
+        """)
+        conexao.execute('CREATE INDEX IF NOT EXISTS idx_prazos_acesso ON prazos (ultimo_acesso)')
+        conexao.execute("""
+            CREATE TABLE IF NOT EXISTS estatisticas (
+                nome TEXT PRIMARY KEY,
+                valor INTEGER NOT NULL
+            )
+        """)
+
+    def _verificar_feriados(self):
+        """Recarrega os feriados e descarta entradas antigas se o arquivo mudou"""
+        assinatura = prazos.assinatura_arquivo(self.caminho_feriados)
+        if assinatura == self._assinatura:
+            return
+
+        with self._lock:
+            if assinatura == self._assinatura:
+                return
+            self.versao = prazos.versao_arquivo(self.caminho_feriados)
+            self.feriados = prazos.carregar_feriados(self.caminho_feriados)
+            self._assinatura = assinatura
+            self._conexao().execute('DELETE FROM prazos WHERE versao != ?', (self.versao,))
+
+    def _chave(self, data_publicacao: str, prazo_dias: int, tipo_prazo: str,
+               estado: str, municipio: str) -> str:
+        return '|'.join([self.versao, data_publicacao, str(prazo_dias),
+                         tipo_prazo, estado, municipio])
+
+    def calcular_prazo(self, data_publicacao: str, prazo_dias: int, tipo_prazo: str,
+                       estado: str = '', municipio: str = '') -> Dict:
+        """Mesmo contrato de prazos.calcular_prazo, consultando o cache antes"""
+        self._verificar_feriados()
+        chave = self._chave(data_publicacao, prazo_dias, tipo_prazo, estado, municipio)
+        conexao = self._conexao()
+
+        linha = conexao.execute(
+            'SELECT data_inicio, data_vencimento FROM prazos WHERE chave = ?', (chave,)
+        ).fetchone()
+        if linha:
+            conexao.execute('UPDATE prazos SET ultimo_acesso = ? WHERE chave = ?',
+                            (time.time(), chave))
+            self._contar('acertos')
+            return prazos.montar_resultado(datetime.strptime(linha[0], '%d/%m/%Y'),
+                                           datetime.strptime(linha[1], '%d/%m/%Y'))
+
+        self._contar('falhas')
+        resultado = prazos.calcular_prazo(self.feriados, data_publicacao, prazo_dias,
+                                          tipo_prazo, estado, municipio)
+        if 'erro' in resultado:
+            return resultado
+
+        conexao.execute(
+            'INSERT OR REPLACE INTO prazos VALUES (?, ?, ?, ?, ?)',
+            (chave, self.versao, resultado['data_inicio'], resultado['data_vencimento'], time.time())
+        )
+        with self._lock:
+            self._insercoes += 1
+            despejar = self._insercoes % min(LOTE_ESCRITA, self.limite_entradas) == 0
+        if despejar:
+            self._despejar()
+        return resultado
+
+    def _contar(self, nome: str):
+        with self._lock:
+            setattr(self, nome, getattr(self, nome) + 1)
+            self._pendentes[nome] += 1
+            gravar = sum(self._pendentes.values()) >= LOTE_ESCRITA
+        if gravar:
+            self._gravar_contadores()
+
+    def _gravar_contadores(self):
+        """Soma os contadores deste processo aos totais compartilhados"""
+        with self._lock:
+            pendentes = dict(self._pendentes)
+            self._pendentes = {'acertos': 0, 'falhas': 0}
+        for nome, valor in pendentes.items():
+            if valor:
+                self._conexao().execute(
+                    'INSERT INTO estatisticas VALUES (?, ?) '
+                    'ON CONFLICT(nome) DO UPDATE SET valor = valor + excluded.valor', (nome, valor)
+                )
+
+    def _despejar(self):
+        """Remove os 10% menos usados quando o limite é ultrapassado"""
+        conexao = self._conexao()
+        total = conexao.execute('SELECT COUNT(*) FROM prazos').fetchone()[0]
+        if total <= self.limite_entradas:
+            return
+        excesso = total - self.limite_entradas + max(1, self.limite_entradas // 10)
+        conexao.execute(
+            'DELETE FROM prazos WHERE chave IN '
+            '(SELECT chave FROM prazos ORDER BY ultimo_acesso LIMIT ?)', (excesso,)
+        )
+
+    def estatisticas(self) -> Dict:
+        """Taxa de acerto deste processo e acumulada entre todos os processos"""
+        self._gravar_contadores()
+        conexao = self._conexao()
+        totais = dict(conexao.execute('SELECT nome, valor FROM estatisticas').fetchall())
+        entradas = conexao.execute('SELECT COUNT(*) FROM prazos').fetchone()[0]
+        consultas = self.acertos + self.falhas
+        consultas_totais = totais.get('acertos', 0) + totais.get('falhas', 0)
+
+        return {
+            'versao_feriados': self.versao,
+            'entradas': entradas,
+            'limite_entradas': self.limite_entradas,
+            'acertos': self.acertos,
+            'falhas': self.falhas,
+            'taxa_acerto': self.acertos / consultas if consultas else 0.0,
+            'acertos_totais': totais.get('acertos', 0),
+            'falhas_totais': totais.get('falhas', 0),
+            'taxa_acerto_total': totais.get('acertos', 0) / consultas_totais if consultas_totais else 0.0
+        }
+
+    def limpar(self):
+        """Remove todas as entradas e zera as estatísticas"""
+        conexao = self._conexao()
+        conexao.execute('DELETE FROM prazos')
+        conexao.execute('DELETE FROM estatisticas')
+        with self._lock:
+            self.acertos = 0
+            self.falhas = 0
+            self._pendentes = {'acertos': 0, 'falhas': 0}
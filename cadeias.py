@@ -0,0 +1,247 @@
+"""
+JurisConta - Cadeias de Prazos
+Prazos dependentes (contestação → réplica → especificação de provas...) descritos
+como um grafo: cada etapa começa no vencimento das etapas de que depende ou em
+um evento do processo (publicação, citação, juntada...).
+
+A carteira guarda o resultado de cada etapa de cada processo. Quando um evento
+muda ou o banco de feriados é alterado, só as etapas afetadas e, se o
+vencimento delas mudar, as que dependem delas são recalculadas.
+
+Exemplo:
+    carteira = CarteiraPrazos(prazos.carregar_feriados())
+    carteira.adicionar_caso('0001234-56.2026', MODELO_EXEMPLO,
+                            {'citacao': '10/03/2026'}, estado='São Paulo')
+    carteira.recalcular()
+    carteira.atualizar_evento('0001234-56.2026', 'citacao', '12/03/2026')
+    alteracoes = carteira.recalcular()   # só a cadeia desse processo
+"""
+
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import prazos
+
+# Cadeia ilustrativa do procedimento comum; ajuste prazos e marcos ao caso concreto
+MODELO_EXEMPLO = [
+    {'id': 'contestacao', 'nome': 'Contestação', 'prazo': 15, 'tipo': 'uteis', 'depende_de': ['citacao']},
+    {'id': 'replica', 'nome': 'Réplica', 'prazo': 15, 'tipo': 'uteis', 'depende_de': ['contestacao']},
+    {'id': 'provas', 'nome': 'Especificação de provas', 'prazo': 5, 'tipo': 'uteis',
+     'depende_de': ['replica']},
+]
+
+
+class ModeloCadeia:
+    """Etapas validadas e em ordem topológica"""
+
+    def __init__(self, etapas: Iterable[Dict]):
+        self.etapas: Dict[str, Dict] = {}
+        for etapa in etapas:
+            if etapa['id'] in self.etapas:
+                raise ValueError(f"Etapa duplicada: {etapa['id']}")
+            dependencias = etapa.get('depende_de') or []
+            if isinstance(dependencias, str):
+                dependencias = [dependencias]
+            self.etapas[etapa['id']] = dict(etapa, depende_de=list(dependencias),
+                                            intervalo=int(etapa.get('intervalo', 0)),
+                                            prazo=int(etapa['prazo']))
+
+        # Dependências que não são etapas são eventos do processo
+        self.eventos: Set[str] = {d for e in self.etapas.values() for d in e['depende_de']
+                                  if d not in self.etapas}
+        self.dependentes: Dict[str, List[str]] = {nome: [] for nome in list(self.etapas) + list(self.eventos)}
+        for etapa in self.etapas.values():
+            for dependencia in etapa['depende_de']:
+                self.dependentes[dependencia].append(etapa['id'])
+
+        self.ordem = self._ordenar()
+
+    def _ordenar(self) -> List[str]:
+        """Ordenação topológica (Kahn); ciclos são rejeitados"""
+        pendentes = {nome: sum(d in self.etapas for d in e['depende_de']) for nome, e in self.etapas.items()}
+        fila = [nome for nome, n in pendentes.items() if n == 0]
+        ordem = []
+        while fila:
+            nome = fila.pop(0)
+            ordem.append(nome)
+            for dependente in self.dependentes[nome]:
+                pendentes[dependente] -= 1
+                if pendentes[dependente] == 0:
+                    fila.append(dependente)
+        if len(ordem) != len(self.etapas):
+            ciclo = sorted(set(self.etapas) - set(ordem))
+            raise ValueError(f"Dependência circular entre as etapas: {', '.join(ciclo)}")
+        return ordem
+
+
+class CarteiraPrazos:
+    """Resultados das cadeias de vários processos, com recálculo incremental"""
+
+    def __init__(self, feriados: Dict):
+        self.feriados = feriados
+        self.casos: Dict[str, Dict] = {}
+        self.resultados: Dict[str, Dict[str, Dict]] = {}
+        self.sujos: Dict[str, Set[str]] = {}
+        self.calendarios: Dict[Tuple[str, str], prazos.Calendario] = {}
+        self.recalculadas_ultima_rodada = 0
+
+    def _calendario(self, estado: str, municipio: str) -> prazos.Calendario:
+        chave = (estado, municipio)
+        if chave not in self.calendarios:
+            self.calendarios[chave] = prazos.Calendario(self.feriados, estado, municipio)
+        return self.calendarios[chave]
+
+    @staticmethod
+    def _data(valor) -> Optional[date]:
+        if valor is None or isinstance(valor, date):
+            return valor
+        return datetime.strptime(valor, '%d/%m/%Y').date()
+
+    def _marcar(self, caso_id: str, nomes: Iterable[str]):
+        self.sujos.setdefault(caso_id, set()).update(nomes)
+
+    def adicionar_caso(self, caso_id: str, modelo, eventos: Optional[Dict] = None,
+                       estado: str = '', municipio: str = ''):
+        """Inclui (ou substitui) um processo; todas as etapas dele ficam pendentes"""
+        if not isinstance(modelo, ModeloCadeia):
+            modelo = ModeloCadeia(modelo)
+        self.casos[caso_id] = {
+            'modelo': modelo,
+            'eventos': {nome: self._data(valor) for nome, valor in (eventos or {}).items()},
+            'estado': estado,
+            'municipio': municipio
+        }
+        self.resultados[caso_id] = {}
+        self._marcar(caso_id, modelo.ordem)
+
+    def remover_caso(self, caso_id: str):
+        self.casos.pop(caso_id, None)
+        self.resultados.pop(caso_id, None)
+        self.sujos.pop(caso_id, None)
+
+    def atualizar_evento(self, caso_id: str, evento: str, valor):
+        """Altera a data de um evento; só as etapas que dependem dele ficam pendentes"""
+        caso = self.casos[caso_id]
+        data = self._data(valor)
+        if caso['eventos'].get(evento) == data:
+            return
+        caso['eventos'][evento] = data
+        self._marcar(caso_id, caso['modelo'].dependentes.get(evento, []))
+
+    def atualizar_feriados(self, feriados: Dict):
+        """Troca o banco de feriados e marca apenas as etapas cujo período foi afetado"""
+        # Compara todas as jurisdições em uso, e não só as que já têm calendário em memória
+        alteracoes = {}
+        calendarios = {}
+        for caso in self.casos.values():
+            chave = (caso['estado'], caso['municipio'])
+            if chave in calendarios:
+                continue
+            antigo = self._calendario(*chave)
+            novo = calendarios[chave] = prazos.Calendario(feriados, *chave)
+            anuais = set(antigo.anuais) ^ set(novo.anuais)
+            datados = set(antigo.datados) ^ set(novo.datados)
+            if anuais or datados:
+                alteracoes[chave] = (anuais, datados)
+
+        self.feriados = feriados
+        self.calendarios = calendarios
+        if not alteracoes:
+            return
+
+        um_dia = timedelta(days=1)
+        for caso_id, caso in self.casos.items():
+            mudancas = alteracoes.get((caso['estado'], caso['municipio']))
+            if not mudancas:
+                continue
+            anuais, datados = mudancas
+            for nome, resultado in self.resultados[caso_id].items():
+                # A contagem só examina os dias entre o evento (exclusive) e o vencimento
+                dia = resultado['data_evento'] + um_dia
+                while dia <= resultado['data_vencimento']:
+                    if dia in datados or (dia.month, dia.day) in anuais:
+                        self._marcar(caso_id, [nome])
+                        break
+                    dia += um_dia
+
+    def recalcular(self) -> List[Dict]:
+        """Recalcula as etapas pendentes de todos os processos; retorna o que mudou"""
+        alteracoes = []
+        recalculadas = 0
+        sujos, self.sujos = self.sujos, {}
+
+        for caso_id, pendentes in sujos.items():
+            caso = self.casos.get(caso_id)
+            if caso is None:
+                continue
+            modelo = caso['modelo']
+            calendario = self._calendario(caso['estado'], caso['municipio'])
+            resultados = self.resultados[caso_id]
+
+            for nome in modelo.ordem:
+                if nome not in pendentes:
+                    continue
+                etapa = modelo.etapas[nome]
+                recalculadas += 1
+
+                marcos = [caso['eventos'].get(d) if d in modelo.eventos
+                          else resultados.get(d, {}).get('data_vencimento')
+                          for d in etapa['depende_de']]
+                anterior = resultados.get(nome)
+
+                if not marcos or any(m is None for m in marcos):
+                    # Falta um evento ou uma etapa anterior: a etapa fica sem resultado
+                    novo = None
+                else:
+                    data_evento = max(marcos) + timedelta(days=etapa['intervalo'])
+                    data_inicio, data_vencimento = calendario.calcular_vencimento(
+                        data_evento, etapa['prazo'], etapa['tipo'])
+                    novo = {'data_evento': data_evento, 'data_inicio': data_inicio,
+                            'data_vencimento': data_vencimento}
+
+                if novo == anterior:
+                    continue
+                if novo is None:
+                    resultados.pop(nome, None)
+                else:
+                    resultados[nome] = novo
+                alteracoes.append({
+                    'caso': caso_id,
+                    'etapa': nome,
+                    'vencimento_anterior': anterior['data_vencimento'] if anterior else None,
+                    'vencimento': novo['data_vencimento'] if novo else None
+                })
+                # Só propaga quando o vencimento desta etapa mudou
+                if (anterior or {}).get('data_vencimento') != (novo or {}).get('data_vencimento'):
+                    pendentes.update(modelo.dependentes[nome])
+
+        self.recalculadas_ultima_rodada = recalculadas
+        return alteracoes
+
+    def consultar(self, caso_id: str) -> List[Dict]:
+        """Etapas do processo na ordem da cadeia, no formato de calcular_prazo"""
+        caso = self.casos[caso_id]
+        hoje = datetime.now().date()
+        saida = []
+        for nome in caso['modelo'].ordem:
+            etapa = caso['modelo'].etapas[nome]
+            resultado = self.resultados[caso_id].get(nome)
+            linha = {'etapa': nome, 'nome': etapa.get('nome', nome), 'prazo': etapa['prazo'],
+                     'tipo': etapa['tipo']}
+            if resultado:
+                linha['data_evento'] = resultado['data_evento'].strftime('%d/%m/%Y')
+                linha.update(prazos.montar_resultado(resultado['data_inicio'],
+                                                     resultado['data_vencimento'], hoje))
+            else:
+                linha['pendente'] = True
+            saida.append(linha)
+        return saida
+
+    def estatisticas(self) -> Dict:
+        return {
+            'casos': len(self.casos),
+            'etapas_calculadas': sum(len(r) for r in self.resultados.values()),
+            'etapas_pendentes': sum(len(s) for s in self.sujos.values()),
+            'recalculadas_ultima_rodada': self.recalculadas_ultima_rodada,
+            'jurisdicoes': len(self.calendarios)
+        }
@@ -0,0 +1,459 @@
+"""
+JurisConta - Teste de Carga
+Simula sessões concorrentes do app web ou de uma API HTTP que use o motor de
+prazos, medindo latência, vazão, erros e memória
+
+Alvos:
+    app        Sessões reais do web.py via streamlit.testing (AppTest): cada ação
+               preenche o formulário com entradas geradas, clica em calcular e
+               reexecuta o script, exercitando calcular_prazo. O script roda neste
+               processo, como em um worker do Streamlit; a RSS medida é a dele.
+    api        URL com placeholders preenchidos a cada requisição.
+    streamlit  Apenas carga estática e de health-check em um servidor Streamlit
+               (HTML, /_stcore/health e /_stcore/host-config). Não executa o
+               script nem calcula prazos; serve para medir o servidor HTTP em si.
+
+Exemplos:
+    # 20 sessões do web.py por 60 segundos (dimensionamento por worker)
+    python carga.py --alvo app --sessoes 20 --duracao 60
+
+    # Aponta para uma API já em execução
+    python carga.py --alvo api --pid 1234 \\
+        --url "http://localhost:8000/prazo?data={data}&prazo={prazo}&tipo={tipo}&estado={estado}&municipio={municipio}"
+
+    # Carga estática/health-check num Streamlit iniciado localmente
+    python carga.py --iniciar-streamlit --sessoes 50 --duracao 60
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+import prazos
+
+DESCRICAO_ALVOS = {
+    'app': 'sessões do web.py com cálculo de prazo (AppTest)',
+    'api': 'API HTTP do motor de prazos',
+    'streamlit': 'somente páginas estáticas e health-check; não calcula prazos'
+}
+
+# Caminhos estáticos e de health-check requisitados no alvo "streamlit"
+CAMINHOS_STREAMLIT = ['/', '/_stcore/health', '/_stcore/host-config']
+
+# Script exercitado pelo alvo "app"
+ARQUIVO_APP = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'web.py')
+
+# O AppTest recompila o script a cada execução e ast.parse em threads simultâneas
+# falha em algumas versões do CPython; as execuções são serializadas, como o GIL
+# já faz com um script só de CPU num worker, e a latência inclui a espera na fila
+LOCK_EXECUCAO = threading.Lock()
+
+# Distribuição aproximada do tráfego real
+PRAZOS_PESOS = {5: 30, 10: 15, 15: 40, 30: 15}
+TIPOS_PESOS = {'uteis': 85, 'corridos': 15}
+
+# Estado de cada município do feriados.json; uma consulta municipal informa os dois,
+# como na interface, para que valham também os feriados estaduais
+ESTADO_DO_MUNICIPIO = {
+    'São Paulo': 'São Paulo', 'Rio de Janeiro': 'Rio de Janeiro', 'Brasília': 'Distrito Federal',
+    'Salvador': 'Bahia', 'Fortaleza': 'Ceará', 'Belo Horizonte': 'Minas Gerais',
+    'Manaus': 'Amazonas', 'Curitiba': 'Paraná', 'Recife': 'Pernambuco',
+    'Porto Alegre': 'Rio Grande do Sul', 'Belém': 'Pará', 'Goiânia': 'Goiás',
+    'Guarulhos': 'São Paulo', 'Campinas': 'São Paulo', 'São Luís': 'Maranhão',
+    'São Gonçalo': 'Rio de Janeiro', 'Maceió': 'Alagoas', 'Duque de Caxias': 'Rio de Janeiro',
+    'Natal': 'Rio Grande do Norte', 'Campo Grande': 'Mato Grosso do Sul', 'Teresina': 'Piauí',
+    'São Bernardo do Campo': 'São Paulo', 'Nova Iguaçu': 'Rio de Janeiro',
+    'João Pessoa': 'Paraíba', 'Santo André': 'São Paulo', 'Osasco': 'São Paulo',
+    'Jaboatão dos Guararapes': 'Pernambuco', 'Ribeirão Preto': 'São Paulo',
+    'Uberlândia': 'Minas Gerais', 'Sorocaba': 'São Paulo', 'Contagem': 'Minas Gerais',
+    'Aracaju': 'Sergipe', 'Feira de Santana': 'Bahia', 'Cuiabá': 'Mato Grosso',
+    'Juiz de Fora': 'Minas Gerais', 'Joinville': 'Santa Catarina', 'Londrina': 'Paraná',
+    'Aparecida': 'São Paulo', 'Gramado': 'Rio Grande do Sul', 'Blumenau': 'Santa Catarina',
+}
+
+
+class GeradorEntradas:
+    """Gera combinações realistas de jurisdição, prazo e data de publicação"""
+
+    def __init__(self, feriados: Dict, semente: Optional[int] = None):
+        self.rng = random.Random(semente)
+        self.estados = sorted(feriados.get('estaduais', {}).keys())
+        # Municípios importados depois, sem estado conhecido, são consultados sem estado
+        self.municipios = [(municipio, ESTADO_DO_MUNICIPIO.get(municipio, ''))
+                           for municipio in sorted(feriados.get('municipais', {}).keys())]
+        self.hoje = datetime.now()
+
+    def proxima(self) -> Dict:
+        """Retorna um conjunto de entradas para calcular_prazo"""
+        prazo = self.rng.choices(list(PRAZOS_PESOS), weights=list(PRAZOS_PESOS.values()))[0]
+        tipo = self.rng.choices(list(TIPOS_PESOS), weights=list(TIPOS_PESOS.values()))[0]
+        data = self.hoje + timedelta(days=self.rng.randint(-60, 30))
+
+        # Um terço das consultas informa município e estado, metade informa só o estado
+        estado = municipio = ''
+        sorteio = self.rng.random()
+        if sorteio < 0.33 and self.municipios:
+            municipio, estado = self.rng.choice(self.municipios)
+        elif sorteio < 0.83 and self.estados:
+            estado = self.rng.choice(self.estados)
+
+        return {
+            'data': data.strftime('%d/%m/%Y'),
+            'prazo': prazo,
+            'tipo': tipo,
+            'estado': estado,
+            'municipio': municipio
+        }
+
+
+class Metricas:
+    """Acumula resultados das requisições de todas as sessões"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencias: List[float] = []
+        self.erros = 0
+        self.erros_por_tipo: Dict[str, int] = {}
+        self.memoria: List[Dict] = []
+
+    def registrar(self, latencia: float, erro: Optional[str] = None):
+        with self.lock:
+            if erro:
+                self.erros += 1
+                self.erros_por_tipo[erro] = self.erros_por_tipo.get(erro, 0) + 1
+            else:
+                self.latencias.append(latencia)
+
+
+def percentil(valores: List[float], p: float) -> float:
+    """Percentil pelo método do posto mais próximo (valores já ordenados)"""
+    if not valores:
+        return 0.0
+    posto = max(1, math.ceil(p / 100 * len(valores)))
+    return valores[min(posto, len(valores)) - 1]
+
+
+def ler_rss(pid: int) -> Optional[int]:
+    """Lê a memória residente (em KB) de um processo via /proc"""
+    try:
+        with open(f'/proc/{pid}/status', 'r') as f:
+            for linha in f:
+                if linha.startswith('VmRSS:'):
+                    return int(linha.split()[1])
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def rss_total(pid: int) -> Optional[int]:
+    """Soma a RSS do processo e de seus filhos diretos (ex.: wrapper do streamlit)"""
+    total = ler_rss(pid)
+    if total is None:
+        return None
+    try:
+        with open(f'/proc/{pid}/task/{pid}/children', 'r') as f:
+            filhos = [int(p) for p in f.read().split()]
+    except (OSError, ValueError):
+        filhos = []
+    for filho in filhos:
+        total += ler_rss(filho) or 0
+    return total
+
+
+def montar_requisicao(args, entradas: Dict, caminho: str = '') -> urllib.request.Request:
+    """Monta a requisição HTTP para o alvo configurado"""
+    if args.alvo == 'streamlit':
+        return urllib.request.Request(args.url.rstrip('/') + caminho)
+
+    if args.metodo == 'POST':
+        corpo = json.dumps(entradas).encode('utf-8')
+        return urllib.request.Request(args.url, data=corpo, method='POST',
+                                      headers={'Content-Type': 'application/json'})
+
+    valores = {chave: urllib.parse.quote(str(valor)) for chave, valor in entradas.items()}
+    return urllib.request.Request(args.url.format(**valores))
+
+
+def executar_requisicao(req: urllib.request.Request, timeout: float, metricas: Metricas):
+    """Executa uma requisição e registra latência ou erro"""
+    inicio = time.perf_counter()
+    try:
+        with urllib.request.urlopen(req, timeout=timeout) as resposta:
+            resposta.read()
+        metricas.registrar(time.perf_counter() - inicio)
+    except urllib.error.HTTPError as e:
+        metricas.registrar(time.perf_counter() - inicio, f'HTTP {e.code}')
+    except (urllib.error.URLError, socket.timeout, ConnectionError) as e:
+        motivo = getattr(e, 'reason', e)
+        metricas.registrar(time.perf_counter() - inicio, type(motivo).__name__)
+
+
+def sessao(args, gerador: GeradorEntradas, lock_gerador: threading.Lock,
+           metricas: Metricas, fim: float, parar: threading.Event):
+    """Laço de uma sessão simulada até o fim do teste"""
+    while time.perf_counter() < fim and not parar.is_set():
+        with lock_gerador:
+            entradas = gerador.proxima()
+            pausa = gerador.rng.uniform(0, args.pausa * 2) if args.pausa else 0
+
+        if args.alvo == 'streamlit':
+            for caminho in CAMINHOS_STREAMLIT:
+                executar_requisicao(montar_requisicao(args, entradas, caminho), args.timeout, metricas)
+        else:
+            executar_requisicao(montar_requisicao(args, entradas), args.timeout, metricas)
+
+        if pausa:
+            time.sleep(pausa)
+
+
+def selecionar(widgets, prefixo: str):
+    """Widget do AppTest pelo início do rótulo (o web.py não define keys)"""
+    for widget in widgets:
+        if str(widget.label).startswith(prefixo):
+            return widget
+    raise LookupError(f'Widget não encontrado: {prefixo!r}')
+
+
+def sessao_app(args, gerador: GeradorEntradas, lock_gerador: threading.Lock,
+               metricas: Metricas, fim: float, parar: threading.Event):
+    """Sessão do web.py via AppTest: cada ação é uma reexecução com o formulário preenchido"""
+    from streamlit.testing.v1 import AppTest
+
+    app = AppTest.from_file(ARQUIVO_APP, default_timeout=args.timeout)
+    inicio = time.perf_counter()
+    try:
+        with LOCK_EXECUCAO:
+            app.run()
+        metricas.registrar(time.perf_counter() - inicio, 'exceção no script' if app.exception else None)
+    except Exception as e:
+        metricas.registrar(time.perf_counter() - inicio, type(e).__name__)
+        return
+
+    while time.perf_counter() < fim and not parar.is_set():
+        with lock_gerador:
+            entradas = gerador.proxima()
+            pausa = gerador.rng.uniform(0, args.pausa * 2) if args.pausa else 0
+
+        inicio = time.perf_counter()
+        try:
+            selecionar(app.date_input, '📅').set_value(datetime.strptime(entradas['data'], '%d/%m/%Y').date())
+            selecionar(app.number_input, '📌').set_value(entradas['prazo'])
+            selecionar(app.radio, '⏱️').set_value('Dias Úteis' if entradas['tipo'] == 'uteis' else 'Dias Corridos')
+            selecionar(app.selectbox, '🏛️').set_value(entradas['estado'])
+            selecionar(app.selectbox, '🏙️').set_value(entradas['municipio'])
+            selecionar(app.button, '🚀').click()
+            with LOCK_EXECUCAO:
+                app.run()
+            if app.exception:
+                erro = 'exceção no script'
+            elif any(str(e.value).startswith('❌') for e in app.error):
+                erro = 'erro no cálculo'  # Os demais st.error são avisos de prazo vencido
+            else:
+                erro = None
+            metricas.registrar(time.perf_counter() - inicio, erro)
+        except Exception as e:
+            metricas.registrar(time.perf_counter() - inicio, type(e).__name__)
+
+        if pausa:
+            time.sleep(pausa)
+
+
+def amostrar_memoria(pid: int, metricas: Metricas, intervalo: float, parar: threading.Event):
+    """Amostra a RSS do servidor periodicamente"""
+    inicio = time.perf_counter()
+    while not parar.is_set():
+        rss = rss_total(pid)
+        if rss is not None:
+            with metricas.lock:
+                metricas.memoria.append({
+                    'segundos': round(time.perf_counter() - inicio, 1),
+                    'rss_kb': rss,
+                    'requisicoes': len(metricas.latencias) + metricas.erros
+                })
+        parar.wait(intervalo)
+
+
+def iniciar_streamlit(porta: int) -> subprocess.Popen:
+    """Sobe o web.py localmente e aguarda o health-check responder"""
+    diretorio = os.path.dirname(os.path.abspath(__file__))
+    processo = subprocess.Popen(
+        [sys.executable, '-m', 'streamlit', 'run', 'web.py',
+         f'--server.port={porta}', '--server.headless=true'],
+        cwd=diretorio, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    url = f'http://localhost:{porta}/_stcore/health'
+    limite = time.time() + 60
+    while time.time() < limite:
+        if processo.poll() is not None:
+            raise RuntimeError('O Streamlit encerrou antes de ficar disponível')
+        try:
+            with urllib.request.urlopen(url, timeout=2):
+                return processo
+        except (urllib.error.URLError, ConnectionError, socket.timeout):
+            time.sleep(0.5)
+    processo.terminate()
+    raise RuntimeError('O Streamlit não respondeu ao health-check em 60 segundos')
+
+
+def gerar_relatorio(args, metricas: Metricas, duracao: float) -> Dict:
+    """Consolida as métricas do teste"""
+    latencias = sorted(metricas.latencias)
+    total = len(latencias) + metricas.erros
+    rss = [amostra['rss_kb'] for amostra in metricas.memoria]
+
+    return {
+        'alvo': args.alvo,
+        'descricao': DESCRICAO_ALVOS[args.alvo],
+        'url': args.url,
+        'sessoes': args.sessoes,
+        'duracao_s': round(duracao, 2),
+        'requisicoes': total,
+        'vazao_rps': round(len(latencias) / duracao, 2) if duracao else 0.0,
+        'taxa_erro': round(metricas.erros / total, 4) if total else 0.0,
+        'erros': metricas.erros_por_tipo,
+        'latencia_ms': {
+            'p50': round(percentil(latencias, 50) * 1000, 2),
+            'p95': round(percentil(latencias, 95) * 1000, 2),
+            'p99': round(percentil(latencias, 99) * 1000, 2),
+            'max': round(latencias[-1] * 1000, 2) if latencias else 0.0
+        },
+        'rss_kb': {
+            'inicial': rss[0] if rss else None,
+            'pico': max(rss) if rss else None,
+            'final': rss[-1] if rss else None
+        },
+        'memoria': metricas.memoria
+    }
+
+
+def exibir_relatorio(relatorio: Dict):
+    """Imprime o relatório em formato legível"""
+    lat = relatorio['latencia_ms']
+    rss = relatorio['rss_kb']
+    linhas = [
+        '=' * 60,
+        f"Alvo: {relatorio['alvo']}  ({relatorio['url']})",
+        f"      {relatorio['descricao']}",
+        f"Sessões: {relatorio['sessoes']}  Duração: {relatorio['duracao_s']}s",
+        '-' * 60,
+        f"Requisições:     {relatorio['requisicoes']}",
+        f"Vazão:           {relatorio['vazao_rps']} req/s",
+        f"Taxa de erro:    {relatorio['taxa_erro'] * 100:.2f}%",
+        f"Latência p50:    {lat['p50']} ms",
+        f"Latência p95:    {lat['p95']} ms",
+        f"Latência p99:    {lat['p99']} ms",
+        f"Latência máxima: {lat['max']} ms",
+    ]
+    for tipo, quantidade in sorted(relatorio['erros'].items()):
+        linhas.append(f"  erro {tipo}: {quantidade}")
+
+    if rss['pico'] is not None:
+        linhas.append('-' * 60)
+        linhas.append(f"RSS do servidor: inicial {rss['inicial'] / 1024:.1f} MB, "
+                      f"pico {rss['pico'] / 1024:.1f} MB, final {rss['final'] / 1024:.1f} MB")
+        linhas.append(f"{'tempo (s)':>10} {'RSS (MB)':>10} {'requisições':>12}")
+        for amostra in relatorio['memoria']:
+            linhas.append(f"{amostra['segundos']:>10} {amostra['rss_kb'] / 1024:>10.1f} "
+                          f"{amostra['requisicoes']:>12}")
+    linhas.append('=' * 60)
+    print('\n'.join(linhas))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Teste de carga local do JurisConta')
+    parser.add_argument('--alvo', choices=['app', 'api', 'streamlit'], default='app',
+                        help='app: sessões reais do web.py (AppTest); api: URL com placeholders; '
+                             'streamlit: só páginas estáticas e health-check')
+    parser.add_argument('--url', default='http://localhost:8501',
+                        help='URL base (streamlit) ou modelo com {data}, {prazo}, {tipo}, '
+                             '{estado} e {municipio} (api)')
+    parser.add_argument('--metodo', choices=['GET', 'POST'], default='GET',
+                        help='Na api, POST envia as entradas como JSON para a URL')
+    parser.add_argument('--sessoes', type=int, default=10, help='Sessões simultâneas')
+    parser.add_argument('--duracao', type=float, default=30, help='Duração do teste em segundos')
+    parser.add_argument('--pausa', type=float, default=0.5,
+                        help='Tempo médio de "leitura" entre ações de uma sessão (s)')
+    parser.add_argument('--timeout', type=float, default=30, help='Timeout por requisição (s)')
+    parser.add_argument('--pid', type=int, help='PID do servidor para medir a RSS (no alvo app: este processo)')
+    parser.add_argument('--iniciar-streamlit', action='store_true',
+                        help='Sobe o web.py localmente para o alvo streamlit (carga estática) e mede a RSS dele')
+    parser.add_argument('--porta', type=int, default=8501, help='Porta usada com --iniciar-streamlit')
+    parser.add_argument('--intervalo-memoria', type=float, default=1.0,
+                        help='Intervalo entre amostras de RSS (s)')
+    parser.add_argument('--semente', type=int, help='Semente do gerador de entradas')
+    parser.add_argument('--json', help='Grava o relatório completo neste arquivo')
+    args = parser.parse_args()
+
+    feriados = prazos.carregar_feriados()
+
+    processo = None
+    alvo_sessao = sessao
+    if args.alvo == 'app' and not args.iniciar_streamlit:
+        try:
+            import streamlit.testing.v1  # noqa: F401
+        except ImportError:
+            parser.error('o alvo app requer o Streamlit (pip install -r requirements-web.txt)')
+        alvo_sessao = sessao_app
+        args.url = ARQUIVO_APP
+        args.pid = args.pid or os.getpid()
+    elif args.iniciar_streamlit:
+        args.alvo = 'streamlit'
+        args.url = f'http://localhost:{args.porta}'
+        processo = iniciar_streamlit(args.porta)
+        args.pid = processo.pid
+
+    metricas = Metricas()
+    gerador = GeradorEntradas(feriados, args.semente)
+    lock_gerador = threading.Lock()
+    parar = threading.Event()
+
+    amostrador = None
+    if args.pid:
+        amostrador = threading.Thread(target=amostrar_memoria,
+                                      args=(args.pid, metricas, args.intervalo_memoria, parar),
+                                      daemon=True)
+        amostrador.start()
+
+    inicio = time.perf_counter()
+    fim = inicio + args.duracao
+    threads = [threading.Thread(target=alvo_sessao, args=(args, gerador, lock_gerador, metricas, fim, parar),
+                                daemon=True)
+               for _ in range(args.sessoes)]
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    except KeyboardInterrupt:
+        print('\nInterrompido, consolidando resultados parciais...')
+    parar.set()
+    duracao = time.perf_counter() - inicio
+
+    if amostrador:
+        amostrador.join()
+    if processo:
+        processo.terminate()
+        processo.wait()
+
+    relatorio = gerar_relatorio(args, metricas, duracao)
+    exibir_relatorio(relatorio)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(relatorio, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,335 @@
+"""
+JurisConta - Exportação iCalendar
+Exporta prazos calculados e calendários de dias não úteis em formato .ics
+
+Exemplos:
+    # Um lote de prazos (CSV com data_publicacao, prazo, tipo, estado, municipio, id, descricao)
+    python exportar_ics.py prazos lote.csv -o prazos.ics --estado-exportacao prazos.db
+
+    # Feriados e suspensões de uma jurisdição
+    python exportar_ics.py calendario --estado "São Paulo" --de 2026 --ate 2027 -o sp.ics
+
+Os eventos são escritos um a um (a memória não cresce com o tamanho do lote).
+Com --estado-exportacao, cada UID guarda o hash do conteúdo entre exportações:
+eventos inalterados mantêm SEQUENCE e DTSTAMP, alterados recebem SEQUENCE + 1
+e os que sumiram do lote são emitidos como cancelados. --somente-alterados
+grava apenas o que mudou desde a última exportação.
+
+O estado é separado por feed (nome do calendário: o lote de prazos ou cada
+jurisdição), então um mesmo arquivo pode ser reaproveitado entre comandos. Dentro
+de um feed, cada exportação é tratada como o lote completo: um lote parcial
+cancela todos os eventos que não estiverem nele.
+"""
+
+import argparse
+import dbm
+import hashlib
+import re
+import sys
+import unicodedata
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO
+
+import prazos
+
+PRODID = '-//JurisConta//Calculadora de Prazos Processuais//PT-BR'
+DOMINIO_UID = 'jurisconta'
+
+# Rodada gravada nos UIDs já emitidos como cancelados
+CANCELADO = 'cancelado'
+
+
+def escapar_texto(texto: str) -> str:
+    """Escapa um valor TEXT (RFC 5545, seção 3.3.11)"""
+    return (texto.replace('\\', '\\\\').replace(';', '\\;')
+            .replace(',', '\\,').replace('\r\n', '\\n').replace('\n', '\\n'))
+
+
+def dobrar_linha(linha: str) -> str:
+    """Quebra linhas com mais de 75 octetos, sem partir caracteres UTF-8"""
+    if len(linha.encode('utf-8')) <= 75:
+        return linha + '\r\n'
+    if linha.isascii():
+        partes = [linha[:75]] + [' ' + linha[i:i + 74] for i in range(75, len(linha), 74)]
+        return '\r\n'.join(partes) + '\r\n'
+    partes = []
+    atual = ''
+    tamanho = 0
+    limite = 75
+    for caractere in linha:
+        octetos = len(caractere.encode('utf-8'))
+        if tamanho + octetos > limite:
+            partes.append(atual)
+            atual, tamanho, limite = ' ', 1, 75
+        atual += caractere
+        tamanho += octetos
+    partes.append(atual)
+    return '\r\n'.join(partes) + '\r\n'
+
+
+def formatar_data(dia: date) -> str:
+    return dia.strftime('%Y%m%d')
+
+
+def slug(texto: str) -> str:
+    texto = unicodedata.normalize('NFKD', texto)
+    texto = ''.join(c for c in texto if not unicodedata.combining(c)).lower()
+    return re.sub(r'[^a-z0-9]+', '-', texto).strip('-') or 'brasil'
+
+
+class EstadoExportacao:
+    """Hash, SEQUENCE e DTSTAMP de cada UID entre exportações (arquivo dbm)
+
+    As chaves são separadas por feed (o nome do calendário): o mesmo arquivo pode
+    servir a várias exportações sem que uma cancele os eventos da outra.
+    """
+
+    def __init__(self, caminho: str, feed: str = ''):
+        self.db = dbm.open(caminho, 'c')
+        self.prefixo = f'{feed}\t'.encode('utf-8')
+        self.rodada = uuid.uuid4().hex[:8]
+
+    def registrar(self, uid: str, hash_conteudo: str, dtstart: str, resumo: str, agora: str):
+        """Retorna (sequence, dtstamp, alterado) e marca o UID como visto nesta rodada"""
+        chave = self.prefixo + uid.encode('utf-8')
+        anterior = self.db.get(chave)
+        if anterior:
+            hash_anterior, sequencia, dtstamp, rodada, *_ = anterior.decode('utf-8').split('|', 5)
+            sequencia = int(sequencia)
+            # Um UID cancelado que volta ao lote continua a partir da SEQUENCE do cancelamento
+            alterado = rodada == CANCELADO or hash_anterior != hash_conteudo
+            if alterado:
+                sequencia, dtstamp = sequencia + 1, agora
+        else:
+            sequencia, dtstamp, alterado = 0, agora, True
+        valor = '|'.join([hash_conteudo, str(sequencia), dtstamp, self.rodada, dtstart, resumo])
+        self.db[chave] = valor.encode('utf-8')
+        return sequencia, dtstamp, alterado
+
+    def removidos(self, agora: str) -> Iterator[Dict]:
+        """UIDs deste feed exportados antes e ausentes nesta rodada
+
+        Ficam no estado como cancelados, com a SEQUENCE do cancelamento, para que
+        uma reexportação posterior do mesmo UID receba uma SEQUENCE maior.
+        """
+        cancelados = {}
+        for chave in self.db.keys():
+            if not chave.startswith(self.prefixo):
+                continue
+            _, sequencia, _, rodada, dtstart, resumo = self.db[chave].decode('utf-8').split('|', 5)
+            if rodada not in (self.rodada, CANCELADO):
+                sequencia = int(sequencia) + 1
+                cancelados[chave] = '|'.join(['', str(sequencia), agora, CANCELADO, dtstart, resumo])
+                yield {'uid': chave[len(self.prefixo):].decode('utf-8'), 'sequencia': sequencia,
+                       'dtstart': dtstart, 'resumo': resumo}
+        for chave, valor in cancelados.items():
+            self.db[chave] = valor.encode('utf-8')
+
+    def fechar(self):
+        self.db.close()
+
+
+class EscritorICS:
+    """Escreve um VCALENDAR evento a evento, sem acumular o arquivo em memória"""
+
+    def __init__(self, arquivo: TextIO, nome: str = 'JurisConta',
+                 estado: Optional[EstadoExportacao] = None, somente_alterados: bool = False):
+        self.arquivo = arquivo
+        self.nome = nome
+        self.estado = estado
+        self.somente_alterados = somente_alterados and estado is not None
+        self.agora = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+        self.escritos = 0
+        self.inalterados = 0
+        self.cancelados = 0
+
+    def __enter__(self):
+        self.abrir()
+        return self
+
+    def __exit__(self, tipo_excecao, *_):
+        # Se a exportação falhou no meio, não cancela os eventos que não chegaram a ser vistos
+        self.fechar(cancelar_removidos=tipo_excecao is None)
+
+    def _linha(self, linha: str):
+        self.arquivo.write(dobrar_linha(linha))
+
+    def abrir(self):
+        self._linha('BEGIN:VCALENDAR')
+        self._linha('VERSION:2.0')
+        self._linha(f'PRODID:{PRODID}')
+        self._linha('CALSCALE:GREGORIAN')
+        self._linha(f'X-WR-CALNAME:{escapar_texto(self.nome)}')
+
+    def evento(self, uid: str, dia: date, resumo: str, descricao: str = '',
+               categorias: Optional[List[str]] = None):
+        """Evento de dia inteiro"""
+        propriedades = [
+            f'DTSTART;VALUE=DATE:{formatar_data(dia)}',
+            f'DTEND;VALUE=DATE:{formatar_data(dia + timedelta(days=1))}',
+            f'SUMMARY:{escapar_texto(resumo)}',
+            'TRANSP:TRANSPARENT',
+        ]
+        if descricao:
+            propriedades.append(f'DESCRIPTION:{escapar_texto(descricao)}')
+        if categorias:
+            propriedades.append('CATEGORIES:' + ','.join(escapar_texto(c) for c in categorias))
+
+        sequencia, dtstamp = 0, self.agora
+        if self.estado is not None:
+            hash_conteudo = hashlib.sha1('\n'.join(propriedades).encode('utf-8')).hexdigest()[:16]
+            sequencia, dtstamp, alterado = self.estado.registrar(
+                uid, hash_conteudo, formatar_data(dia), resumo.replace('|', '/'), self.agora)
+            if not alterado:
+                self.inalterados += 1
+                if self.somente_alterados:
+                    return
+
+        self._linha('BEGIN:VEVENT')
+        self._linha(f'UID:{uid}')
+        self._linha(f'DTSTAMP:{dtstamp}')
+        self._linha(f'SEQUENCE:{sequencia}')
+        for propriedade in propriedades:
+            self._linha(propriedade)
+        self._linha('END:VEVENT')
+        self.escritos += 1
+
+    def fechar(self, cancelar_removidos: bool = True):
+        # Eventos que saíram do lote desde a última exportação
+        if self.estado is not None and cancelar_removidos:
+            for removido in self.estado.removidos(self.agora):
+                dia = datetime.strptime(removido['dtstart'], '%Y%m%d').date()
+                self._linha('BEGIN:VEVENT')
+                self._linha(f"UID:{removido['uid']}")
+                self._linha(f'DTSTAMP:{self.agora}')
+                self._linha(f"SEQUENCE:{removido['sequencia']}")
+                self._linha(f'DTSTART;VALUE=DATE:{formatar_data(dia)}')
+                self._linha(f'DTEND;VALUE=DATE:{formatar_data(dia + timedelta(days=1))}')
+                self._linha(f"SUMMARY:{escapar_texto(removido['resumo'])}")
+                self._linha('STATUS:CANCELLED')
+                self._linha('END:VEVENT')
+                self.cancelados += 1
+        self._linha('END:VCALENDAR')
+
+
+def uid_prazo(linha: Dict) -> str:
+    """UID estável de um prazo
+
+    Um processo costuma ter vários prazos, então o id sozinho não basta: com etapa
+    ou descrição, o UID é id + etapa/descrição (uma correção de data atualiza o
+    mesmo evento); sem elas, entram também as entradas do cálculo.
+    """
+    rotulo = linha.get('etapa') or linha.get('descricao')
+    if linha.get('id') and rotulo:
+        partes = [linha['id'], rotulo]
+    else:
+        partes = [linha.get('id', '')] + [str(linha.get(c, '')) for c in
+                                          ('data_publicacao', 'prazo', 'tipo', 'estado', 'municipio')]
+    identificador = '|'.join(str(p) for p in partes)
+    return f"prazo-{hashlib.sha1(identificador.encode('utf-8')).hexdigest()[:20]}@{DOMINIO_UID}"
+
+
+def exportar_prazos(escritor: EscritorICS, feriados: Dict, linhas: Iterable[Dict]) -> List[str]:
+    """Calcula e escreve um evento de vencimento por linha; retorna os erros encontrados
+
+    Linhas que repetem o UID de outra (mesmo prazo informado duas vezes) são
+    recusadas: dois eventos com o mesmo UID se sobrescreveriam no cliente.
+    """
+    erros = []
+    uids = set()
+    for posicao, resultado in enumerate(prazos.calcular_lote(feriados, linhas), start=1):
+        numero = resultado.get('linha_arquivo', posicao)
+        if 'erro' in resultado:
+            erros.append(f"linha {numero}: {resultado['erro']} "
+                         f"({resultado['data_publicacao']!r}, {resultado['prazo']!r})")
+            continue
+        uid = uid_prazo(resultado)
+        if uid in uids:
+            erros.append(f"linha {numero}: prazo repetido no lote ({resultado['id']!r}, "
+                         f"{resultado['data_publicacao']!r}, {resultado['prazo']!r})")
+            continue
+        uids.add(uid)
+
+        vencimento = datetime.strptime(resultado['data_vencimento'], '%d/%m/%Y').date()
+        rotulo = resultado.get('descricao') or resultado['id'] or f"Prazo de {resultado['prazo']} dias"
+        jurisdicao = ' - '.join(p for p in (resultado['municipio'], resultado['estado']) if p) or 'Nacional'
+        descricao = '\n'.join([
+            f"Publicação: {resultado['data_publicacao']}",
+            f"Prazo: {resultado['prazo']} dias {'úteis' if resultado['tipo'] == 'uteis' else 'corridos'}",
+            f"Início da contagem: {resultado['data_inicio']}",
+            f"Vencimento: {resultado['data_vencimento']} ({resultado['dia_semana']})",
+            f"Jurisdição: {jurisdicao}",
+        ])
+        escritor.evento(uid, vencimento, f'Vencimento: {rotulo}', descricao, ['Prazo'])
+    return erros
+
+
+def exportar_calendario(escritor: EscritorICS, feriados: Dict, ano_inicio: int, ano_fim: int,
+                        estado: str = '', municipio: str = '', fins_de_semana: bool = False):
+    """Escreve os dias não úteis da jurisdição, ano a ano"""
+    calendario = prazos.Calendario(feriados, estado, municipio)
+    jurisdicao = slug('-'.join(p for p in (estado, municipio) if p))
+    for ano in range(ano_inicio, ano_fim + 1):
+        for dia in calendario.dias_nao_uteis(date(ano, 1, 1), date(ano, 12, 31)):
+            if dia['tipo'] == 'fim_de_semana' and not fins_de_semana:
+                continue
+            uid = f"{formatar_data(dia['data'])}-{jurisdicao}@{DOMINIO_UID}"
+            categoria = {'feriado': 'Feriado', 'suspensao': 'Suspensão de expediente'}.get(
+                dia['tipo'], 'Fim de semana')
+            escritor.evento(uid, dia['data'], dia['motivo'], categorias=[categoria])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Exporta prazos e calendários do JurisConta em .ics')
+    subparsers = parser.add_subparsers(dest='comando', required=True)
+
+    p_prazos = subparsers.add_parser('prazos', help='Vencimentos de um lote de prazos (CSV)')
+    p_prazos.add_argument('lote', help='CSV com data_publicacao, prazo, tipo, estado, municipio, id, descricao')
+
+    p_cal = subparsers.add_parser('calendario', help='Dias não úteis de uma jurisdição')
+    p_cal.add_argument('--estado', default='')
+    p_cal.add_argument('--municipio', default='')
+    p_cal.add_argument('--de', type=int, default=datetime.now().year, help='Ano inicial')
+    p_cal.add_argument('--ate', type=int, help='Ano final (padrão: o inicial)')
+    p_cal.add_argument('--fins-de-semana', action='store_true', help='Inclui sábados e domingos')
+
+    for sub in (p_prazos, p_cal):
+        sub.add_argument('-o', '--saida', default='-', help='Arquivo .ics (padrão: saída padrão)')
+        sub.add_argument('--feriados', default=prazos.ARQUIVO_FERIADOS, help='Banco de feriados')
+        sub.add_argument('--estado-exportacao', help='Arquivo dbm com o estado para reexportação incremental')
+        sub.add_argument('--somente-alterados', action='store_true',
+                         help='Com --estado-exportacao, grava só eventos novos, alterados ou cancelados')
+    args = parser.parse_args()
+
+    if args.comando == 'prazos':
+        nome = 'JurisConta - Prazos'
+    else:
+        nome = 'JurisConta - ' + (' - '.join(p for p in (args.municipio, args.estado) if p) or 'Nacional')
+
+    feriados = prazos.carregar_feriados(args.feriados)
+    estado_exportacao = EstadoExportacao(args.estado_exportacao, nome) if args.estado_exportacao else None
+    saida = sys.stdout if args.saida == '-' else open(args.saida, 'w', encoding='utf-8', newline='')
+
+    erros = []
+    try:
+        with EscritorICS(saida, nome, estado_exportacao, args.somente_alterados) as escritor:
+            if args.comando == 'prazos':
+                erros = exportar_prazos(escritor, feriados, prazos.ler_lote(args.lote))
+            else:
+                exportar_calendario(escritor, feriados, args.de, args.ate or args.de,
+                                    args.estado, args.municipio, args.fins_de_semana)
+    finally:
+        if saida is not sys.stdout:
+            saida.close()
+        if estado_exportacao:
+            estado_exportacao.fechar()
+
+    for erro in erros[:20]:
+        print(f'! {erro}', file=sys.stderr)
+    print(f'{escritor.escritos} eventos escritos, {escritor.inalterados} inalterados, '
+          f'{escritor.cancelados} cancelados, {len(erros)} erros', file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -4,10 +4,12 @@ Calculadora de Prazos Processuais com interface moderna
 """
 
 import tkinter as tk
-from tkinter import ttk, messagebox
-from datetime import datetime, timedelta
-import json
-from typing import Dict, List, Optional
+from tkinter import ttk, messagebox, filedialog
+from datetime import date, datetime
+from typing import Dict
+
+import exportar_ics
+import prazos
 
 
 class CalculadoraPrazosGUI:
@@ -47,139 +49,13 @@ class CalculadoraPrazosGUI:
     
     def carregar_feriados(self):
         """Carrega feriados do arquivo JSON"""
-        try:
-            with open('feriados.json', 'r', encoding='utf-8') as f:
-                self.feriados = json.load(f)
-        except FileNotFoundError:
-            self.feriados = {
-                'nacionais': [],
-                'moveis': [],
-                'estaduais': {},
-                'municipais': {}
-            }
-    
-    def calcular_pascoa(self, ano: int) -> datetime:
-        """Calcula data da Páscoa"""
-        a = ano % 19
-        b = ano // 100
-        c = ano % 100
-        d = b // 4
-        e = b % 4
-        f = (b + 8) // 25
-        g = (b - f + 1) // 3
-        h = (19 * a + b - d - g + 15) % 30
-        i = c // 4
-        k = c % 4
-        l = (32 + 2 * e + 2 * i - h - k) % 7
-        m = (a + 11 * h + 22 * l) // 451
-        mes = (h + l - 7 * m + 114) // 31
-        dia = ((h + l - 7 * m + 114) % 31) + 1
-        return datetime(ano, mes, dia)
-    
-    def calcular_feriados_moveis(self, ano: int):
-        """Calcula feriados móveis"""
-        pascoa = self.calcular_pascoa(ano)
-        carnaval = pascoa - timedelta(days=47)
-        corpus_christi = pascoa + timedelta(days=60)
-        sexta_santa = pascoa - timedelta(days=2)
-        
-        return {
-            'carnaval': carnaval.strftime('%d/%m/%Y'),
-            'carnaval_segunda': (carnaval + timedelta(days=1)).strftime('%d/%m/%Y'),
-            'sexta_santa': sexta_santa.strftime('%d/%m/%Y'),
-            'pascoa': pascoa.strftime('%d/%m/%Y'),
-            'corpus_christi': corpus_christi.strftime('%d/%m/%Y')
-        }
-    
-    def e_feriado(self, data: datetime, estado: str = '', municipio: str = '') -> bool:
-        """Verifica se é feriado"""
-        data_str = data.strftime('%d/%m')
-        data_completa = data.strftime('%d/%m/%Y')
-        
-        # Verifica feriados móveis
-        for feriado in self.feriados.get('moveis', []):
-            if feriado['data'] == data_completa:
-                return True
-        
-        # Verifica nacionais
-        for feriado in self.feriados.get('nacionais', []):
-            if feriado['data'] == data_str:
-                return True
-        
-        # Verifica estaduais
-        if estado and estado in self.feriados.get('estaduais', {}):
-            for feriado in self.feriados['estaduais'][estado]:
-                if feriado['data'] == data_str:
-                    return True
-        
-        # Verifica municipais
-        if municipio and municipio in self.feriados.get('municipais', {}):
-            for feriado in self.feriados['municipais'][municipio]:
-                if feriado['data'] == data_str:
-                    return True
-        
-        return False
-    
-    def e_dia_util(self, data: datetime, estado: str = '', municipio: str = '') -> bool:
-        """Verifica se é dia útil"""
-        if data.weekday() in [5, 6]:  # Sábado ou Domingo
-            return False
-        return not self.e_feriado(data, estado, municipio)
+        self.feriados = prazos.carregar_feriados()
     
     def calcular_prazo(self, data_publicacao: str, prazo_dias: int, 
                       tipo_prazo: str, estado: str = '', municipio: str = '') -> Dict:
         """Calcula o prazo"""
-        try:
-            data_pub = datetime.strptime(data_publicacao, '%d/%m/%Y')
-            data_inicio = data_pub + timedelta(days=1)
-            
-            # Ajusta para primeiro dia útil
-            while not self.e_dia_util(data_inicio, estado, municipio):
-                data_inicio += timedelta(days=1)
-            
-            data_vencimento = data_inicio
-            
-            if tipo_prazo == 'uteis':
-                dias_contados = 0
-                while dias_contados < prazo_dias:
-                    if self.e_dia_util(data_vencimento, estado, municipio):
-                        dias_contados += 1
-                    if dias_contados < prazo_dias:
-                        data_vencimento += timedelta(days=1)
-            else:
-                data_vencimento += timedelta(days=prazo_dias - 1)
-                while not self.e_dia_util(data_vencimento, estado, municipio):
-                    data_vencimento += timedelta(days=1)
-            
-            hoje = datetime.now().date()
-            dias_restantes = (data_vencimento.date() - hoje).days
-            
-            return {
-                'data_inicio': data_inicio.strftime('%d/%m/%Y'),
-                'data_vencimento': data_vencimento.strftime('%d/%m/%Y'),
-                'dia_semana': self.obter_dia_semana(data_vencimento),
-                'dias_restantes': dias_restantes,
-                'status': self.obter_status(dias_restantes)
-            }
-        except ValueError:
-            return {'erro': 'Data inválida. Use o formato dd/mm/aaaa'}
-    
-    def obter_dia_semana(self, data: datetime) -> str:
-        """Retorna dia da semana"""
-        dias = ['segunda-feira', 'terça-feira', 'quarta-feira', 
-                'quinta-feira', 'sexta-feira', 'sábado', 'domingo']
-        return dias[data.weekday()]
-    
-    def obter_status(self, dias_restantes: int) -> str:
-        """Retorna status do prazo"""
-        if dias_restantes < 0:
-            return 'VENCIDO'
-        elif dias_restantes == 0:
-            return 'VENCE HOJE'
-        elif dias_restantes <= 3:
-            return 'VENCE EM BREVE'
-        else:
-            return 'DENTRO DO PRAZO'
+        return prazos.calcular_prazo(self.feriados, data_publicacao, prazo_dias,
+                                     tipo_prazo, estado, municipio)
     
     def criar_interface(self):
         """Cria a interface gráfica"""
@@ -292,6 +168,14 @@ class CalculadoraPrazosGUI:
                 messagebox.showerror("Erro", resultado['erro'])
                 return
             
+            self.ultimo_calculo = {
+                'data_pub': data_pub,
+                'prazo': prazo,
+                'tipo': tipo,
+                'estado': estado,
+                'municipio': municipio,
+                'resultado': resultado
+            }
             self.exibir_resultado(resultado)
             
         except ValueError:
@@ -354,15 +238,179 @@ class CalculadoraPrazosGUI:
                     bg=self.cores['alerta'],
                     fg='white').grid(row=6, column=0, columnspan=2, pady=20, sticky='ew')
         
-        # Botão fechar
-        btn_fechar = tk.Button(janela_resultado, text="Fechar", 
+        # Botões
+        btn_frame = tk.Frame(janela_resultado, bg=self.cores['fundo'])
+        btn_frame.pack(pady=20)
+        
+        btn_calendario = tk.Button(btn_frame, text="📅 Ver Calendário", 
+                                  font=('Arial', 12),
+                                  bg=self.cores['secundaria'],
+                                  fg='white',
+                                  cursor='hand2',
+                                  padx=20, pady=10,
+                                  command=self.exibir_calendario)
+        btn_calendario.pack(side='left', padx=10)
+        
+        btn_exportar = tk.Button(btn_frame, text="📤 Exportar .ics", 
+                                font=('Arial', 12),
+                                bg=self.cores['info'],
+                                fg='white',
+                                cursor='hand2',
+                                padx=20, pady=10,
+                                command=self.exportar_prazo_ics)
+        btn_exportar.pack(side='left', padx=10)
+        
+        btn_fechar = tk.Button(btn_frame, text="Fechar", 
                               font=('Arial', 12),
                               bg=self.cores['primaria'],
                               fg='white',
                               cursor='hand2',
                               padx=30, pady=10,
                               command=janela_resultado.destroy)
-        btn_fechar.pack(pady=20)
+        btn_fechar.pack(side='left', padx=10)
+    
+    def exportar_prazo_ics(self):
+        """Salva o vencimento do último cálculo em um arquivo .ics"""
+        calculo = self.ultimo_calculo
+        vencimento = calculo['resultado']['data_vencimento'].replace('/', '-')
+        caminho = filedialog.asksaveasfilename(defaultextension='.ics',
+                                               initialfile=f'prazo-{vencimento}.ics',
+                                               filetypes=[('iCalendar', '*.ics')])
+        if not caminho:
+            return
+        
+        with open(caminho, 'w', encoding='utf-8', newline='') as f:
+            with exportar_ics.EscritorICS(f, 'JurisConta - Prazos') as escritor:
+                exportar_ics.exportar_prazos(escritor, self.feriados, [{
+                    'data_publicacao': calculo['data_pub'],
+                    'prazo': calculo['prazo'],
+                    'tipo': calculo['tipo'],
+                    'estado': calculo['estado'],
+                    'municipio': calculo['municipio']
+                }])
+        messagebox.showinfo("Exportado", f"Prazo exportado para {caminho}")
+    
+    def exibir_calendario(self):
+        """Exibe calendário mensal/anual destacando os dias contados do último cálculo"""
+        calculo = self.ultimo_calculo
+        resultado = calculo['resultado']
+        pub = datetime.strptime(calculo['data_pub'], '%d/%m/%Y').date()
+        inicio = datetime.strptime(resultado['data_inicio'], '%d/%m/%Y').date()
+        venc = datetime.strptime(resultado['data_vencimento'], '%d/%m/%Y').date()
+        
+        indice = prazos.Calendario(self.feriados, calculo['estado'], calculo['municipio'])
+        nao_uteis_por_ano = {}
+        
+        def nao_uteis_do_ano(ano: int) -> Dict:
+            # Uma consulta por ano exibido, reaproveitada na navegação
+            if ano not in nao_uteis_por_ano:
+                dias = indice.dias_nao_uteis(date(ano, 1, 1), date(ano, 12, 31))
+                nao_uteis_por_ano[ano] = {d['data']: d for d in dias}
+            return nao_uteis_por_ano[ano]
+        
+        nao_uteis_prazo = {}
+        for ano in range(inicio.year, venc.year + 1):
+            nao_uteis_prazo.update(nao_uteis_do_ano(ano))
+        contados = set(prazos.dias_contados(inicio, venc, calculo['tipo'], nao_uteis_prazo))
+        
+        janela = tk.Toplevel(self.root)
+        janela.title("Calendário do Prazo")
+        janela.geometry("900x650")
+        janela.configure(bg=self.cores['fundo'])
+        
+        visao = {'ano': venc.year, 'mes': venc.month, 'modo': 'mes'}
+        
+        barra = tk.Frame(janela, bg=self.cores['fundo'])
+        barra.pack(fill='x', padx=20, pady=10)
+        titulo = tk.Label(barra, font=('Arial', 16, 'bold'),
+                         bg=self.cores['fundo'], fg=self.cores['primaria'])
+        
+        conteudo = tk.Frame(janela, bg=self.cores['branco'])
+        conteudo.pack(fill='both', expand=True, padx=20)
+        
+        motivos = tk.Label(janela, font=('Arial', 10), justify='left', anchor='w',
+                          bg=self.cores['fundo'], fg=self.cores['primaria'])
+        motivos.pack(fill='x', padx=20, pady=10)
+        
+        def cor_do_dia(dia: date):
+            info = nao_uteis_do_ano(dia.year).get(dia)
+            if dia == venc:
+                return self.cores['sucesso'], 'white'
+            if dia in contados:
+                return '#d6eaf8', '#1f618d'
+            if info and info['tipo'] == 'suspensao':
+                return '#fdebd0', '#d35400'
+            if info and info['tipo'] == 'feriado':
+                return '#fadbd8', self.cores['perigo']
+            if info:
+                return self.cores['fundo'], '#95a5a6'
+            return self.cores['branco'], 'black'
+        
+        def desenhar_mes(parent, ano: int, mes: int, fonte: int):
+            tk.Label(parent, text=f"{prazos.MESES[mes - 1]} {ano}", font=('Arial', fonte, 'bold'),
+                    bg=self.cores['branco'], fg=self.cores['primaria']).grid(row=0, column=0, columnspan=7)
+            for coluna, letra in enumerate(['D', 'S', 'T', 'Q', 'Q', 'S', 'S']):
+                tk.Label(parent, text=letra, font=('Arial', fonte), width=3,
+                        bg=self.cores['branco'], fg='#7f8c8d').grid(row=1, column=coluna)
+            for linha, semana in enumerate(prazos.grade_mes(ano, mes), start=2):
+                for coluna, dia in enumerate(semana):
+                    if dia is None:
+                        continue
+                    fundo, frente = cor_do_dia(dia)
+                    relevo = 'solid' if dia == pub else 'flat'
+                    tk.Label(parent, text=str(dia.day), font=('Arial', fonte), width=3,
+                            bg=fundo, fg=frente, relief=relevo, borderwidth=1).grid(row=linha, column=coluna,
+                                                                                padx=1, pady=1)
+        
+        def desenhar():
+            for widget in conteudo.winfo_children():
+                widget.destroy()
+            ano, mes = visao['ano'], visao['mes']
+            
+            if visao['modo'] == 'mes':
+                titulo.config(text=f"{prazos.MESES[mes - 1]} {ano}")
+                quadro = tk.Frame(conteudo, bg=self.cores['branco'])
+                quadro.pack(pady=20)
+                desenhar_mes(quadro, ano, mes, 14)
+                inicio_periodo = date(ano, mes, 1)
+                fim_periodo = date(ano + mes // 12, mes % 12 + 1, 1)
+            else:
+                titulo.config(text=f"Ano {ano}")
+                for m in range(1, 13):
+                    quadro = tk.Frame(conteudo, bg=self.cores['branco'], padx=8, pady=8)
+                    quadro.grid(row=(m - 1) // 4, column=(m - 1) % 4, sticky='n')
+                    desenhar_mes(quadro, ano, m, 8)
+                inicio_periodo = date(ano, 1, 1)
+                fim_periodo = date(ano + 1, 1, 1)
+            
+            feriados_periodo = [d for d in nao_uteis_do_ano(ano).values()
+                                if inicio_periodo <= d['data'] < fim_periodo and d['tipo'] != 'fim_de_semana']
+            texto = '\n'.join(f"{d['data'].strftime('%d/%m')} - {d['motivo']}" for d in feriados_periodo[:12])
+            if len(feriados_periodo) > 12:
+                texto += f"\n... e mais {len(feriados_periodo) - 12}"
+            motivos.config(text=texto or "Nenhum feriado no período.")
+        
+        def navegar(passo: int):
+            if visao['modo'] == 'ano':
+                visao['ano'] += passo
+            else:
+                total = visao['ano'] * 12 + visao['mes'] - 1 + passo
+                visao['ano'], visao['mes'] = total // 12, total % 12 + 1
+            desenhar()
+        
+        def alternar_modo():
+            visao['modo'] = 'ano' if visao['modo'] == 'mes' else 'mes'
+            btn_modo.config(text="Ver Mês" if visao['modo'] == 'ano' else "Ver Ano")
+            desenhar()
+        
+        tk.Button(barra, text="◀", font=('Arial', 12), command=lambda: navegar(-1)).pack(side='left')
+        titulo.pack(side='left', expand=True)
+        tk.Button(barra, text="▶", font=('Arial', 12), command=lambda: navegar(1)).pack(side='left')
+        btn_modo = tk.Button(barra, text="Ver Ano", font=('Arial', 11),
+                            bg=self.cores['secundaria'], fg='white', command=alternar_modo)
+        btn_modo.pack(side='right', padx=10)
+        
+        desenhar()
     
     def limpar_formulario(self):
         """Limpa campos do formulário"""
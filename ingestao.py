@@ -0,0 +1,525 @@
+"""
+JurisConta - Ingestão de Feriados
+Importa feriados e suspensões de expediente de arquivos CSV, ICS e JSON
+oficiais para o banco de feriados, de forma incremental
+
+Exemplos:
+    python ingestao.py tjsp-2026.csv suspensoes-cnj.ics --simular
+    python ingestao.py recife.ics --municipio Recife --tipo suspensao --relatorio diff.json
+
+Formato de cada feriado gravado no feriados.json:
+    {"data": "dd/mm", "nome": ...}                   # repete todo ano
+    {"data": "dd/mm/aaaa", "nome": ..., "fonte": ...} # vale apenas naquele ano
+    {"data": ..., "nome": ..., "tipo": "suspensao"}   # suspensão de expediente
+
+CSV e JSON aceitam as colunas data (ou data_inicio/data_fim), nome, escopo,
+estado/uf, municipio/cidade/comarca, tipo, fonte e recorrente. No ICS a
+jurisdição vem de X-JURISCONTA-ESTADO/X-JURISCONTA-MUNICIPIO, do LOCATION ou
+dos parâmetros --estado/--municipio.
+"""
+
+import argparse
+import csv
+import json
+import os
+import re
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import prazos
+
+UFS = {
+    'AC': 'Acre', 'AL': 'Alagoas', 'AP': 'Amapá', 'AM': 'Amazonas', 'BA': 'Bahia',
+    'CE': 'Ceará', 'DF': 'Distrito Federal', 'ES': 'Espírito Santo', 'GO': 'Goiás',
+    'MA': 'Maranhão', 'MT': 'Mato Grosso', 'MS': 'Mato Grosso do Sul', 'MG': 'Minas Gerais',
+    'PA': 'Pará', 'PB': 'Paraíba', 'PR': 'Paraná', 'PE': 'Pernambuco', 'PI': 'Piauí',
+    'RJ': 'Rio de Janeiro', 'RN': 'Rio Grande do Norte', 'RS': 'Rio Grande do Sul',
+    'RO': 'Rondônia', 'RR': 'Roraima', 'SC': 'Santa Catarina', 'SP': 'São Paulo',
+    'SE': 'Sergipe', 'TO': 'Tocantins'
+}
+
+SECOES = {'nacional': 'nacionais', 'estadual': 'estaduais', 'municipal': 'municipais'}
+
+# Nomes de coluna aceitos para cada campo
+ALIASES = {
+    'data': ['data', 'date', 'dia'],
+    'data_inicio': ['data_inicio', 'inicio', 'start'],
+    'data_fim': ['data_fim', 'fim', 'end'],
+    'nome': ['nome', 'descricao', 'descrição', 'name', 'summary'],
+    'escopo': ['escopo', 'abrangencia', 'abrangência', 'nivel', 'nível'],
+    'estado': ['estado', 'uf'],
+    'municipio': ['municipio', 'município', 'cidade', 'comarca'],
+    'tipo': ['tipo'],
+    'fonte': ['fonte', 'source'],
+    'recorrente': ['recorrente', 'anual']
+}
+
+PARTICULAS = {'de', 'da', 'do', 'das', 'dos', 'e'}
+
+# Limite de dias expandidos por intervalo (evita intervalos digitados errado)
+MAXIMO_DIAS_INTERVALO = 366
+
+MAXIMO_ERROS_RELATORIO = 50
+
+# Linhas de diferença impressas no terminal (o relatório JSON traz todas)
+MAXIMO_LINHAS_DIFERENCA = 200
+
+# (escopo, local, data, nome, tipo, fonte)
+Registro = Tuple[str, str, str, str, str, str]
+
+
+class ErroIngestao(ValueError):
+    """Linha de origem que não pôde ser convertida em feriado"""
+
+
+@lru_cache(maxsize=65536)
+def sem_acentos(texto: str) -> str:
+    """Chave de comparação: minúsculas, sem acentos e com espaços normalizados"""
+    texto = unicodedata.normalize('NFKD', texto)
+    texto = ''.join(c for c in texto if not unicodedata.combining(c))
+    return ' '.join(texto.lower().split())
+
+
+def montar_canonicos(feriados: Dict) -> Dict[str, Dict[str, str]]:
+    """Mapeia chaves sem acento para os nomes já usados no banco de feriados"""
+    estados = {sem_acentos(nome): nome for nome in UFS.values()}
+    estados.update({sigla.lower(): nome for sigla, nome in UFS.items()})
+    estados.update({sem_acentos(nome): nome for nome in feriados.get('estaduais', {})})
+    municipios = {sem_acentos(nome): nome for nome in feriados.get('municipais', {})}
+    return {'estados': estados, 'municipios': municipios}
+
+
+def normalizar_estado(nome: str, canonicos: Dict) -> str:
+    estado = canonicos['estados'].get(sem_acentos(nome))
+    if not estado:
+        raise ErroIngestao(f'Estado desconhecido: {nome!r}')
+    return estado
+
+
+def normalizar_municipio(nome: str, canonicos: Dict) -> str:
+    existente = canonicos['municipios'].get(sem_acentos(nome))
+    if existente:
+        return existente
+    nome = ' '.join(nome.split())
+    if nome.isupper() or nome.islower():
+        palavras = nome.lower().split(' ')
+        nome = ' '.join(p if i and p in PARTICULAS else p.capitalize() for i, p in enumerate(palavras))
+    return nome
+
+
+@lru_cache(maxsize=65536)
+def interpretar_data(texto: str) -> Tuple[Optional[date], Optional[Tuple[int, int]]]:
+    """Retorna (data completa, None) ou (None, (dia, mês)) para datas sem ano"""
+    texto = texto.strip()
+    for formato in ('%d/%m/%Y', '%Y-%m-%d', '%d-%m-%Y', '%Y%m%d', '%d.%m.%Y'):
+        try:
+            return datetime.strptime(texto, formato).date(), None
+        except ValueError:
+            continue
+    correspondencia = re.fullmatch(r'(\d{1,2})[/-](\d{1,2})', texto)
+    if correspondencia:
+        dia, mes = int(correspondencia.group(1)), int(correspondencia.group(2))
+        try:
+            date(2000, mes, dia)  # ano bissexto, aceita 29/02
+        except ValueError:
+            raise ErroIngestao(f'Data inválida: {texto!r}')
+        return None, (dia, mes)
+    raise ErroIngestao(f'Data inválida: {texto!r}')
+
+
+def verdadeiro(texto: str) -> bool:
+    return sem_acentos(str(texto)) in ('1', 'sim', 's', 'true', 'x', 'anual', 'yes')
+
+
+def campo(linha: Dict, nome: str) -> str:
+    """Valor do campo pelo primeiro alias presente na linha"""
+    for alias in ALIASES[nome]:
+        valor = linha.get(alias)
+        if valor not in (None, ''):
+            return str(valor).strip()
+    return ''
+
+
+def normalizar_linha(linha: Any, padroes: Dict, canonicos: Dict) -> List[Registro]:
+    """Converte uma linha de origem em um ou mais registros (intervalos são expandidos)"""
+    if isinstance(linha, ErroIngestao):
+        raise linha  # Erro de leitura da linha apontado pelo leitor (ex.: JSON Lines malformado)
+    if not isinstance(linha, dict):
+        raise ErroIngestao(f'Registro não é um objeto: {str(linha)[:60]!r}')
+    linha = {str(chave).strip().lower(): valor for chave, valor in linha.items() if chave}
+
+    nome = campo(linha, 'nome')
+    if not nome:
+        raise ErroIngestao('Feriado sem nome')
+
+    estado = campo(linha, 'estado') or padroes.get('estado', '')
+    municipio = campo(linha, 'municipio') or padroes.get('municipio', '')
+    escopo = sem_acentos(campo(linha, 'escopo'))
+    if escopo not in SECOES:
+        escopo = 'municipal' if municipio else 'estadual' if estado else 'nacional'
+
+    if escopo == 'municipal':
+        if not municipio:
+            raise ErroIngestao(f'{nome}: feriado municipal sem município')
+        local = normalizar_municipio(municipio, canonicos)
+    elif escopo == 'estadual':
+        if not estado:
+            raise ErroIngestao(f'{nome}: feriado estadual sem estado')
+        local = normalizar_estado(estado, canonicos)
+    else:
+        local = ''
+
+    tipo = 'suspensao' if 'suspens' in sem_acentos(campo(linha, 'tipo') or padroes.get('tipo', '')) else 'feriado'
+    fonte = campo(linha, 'fonte') or padroes.get('fonte', '')
+    recorrente = verdadeiro(campo(linha, 'recorrente'))
+
+    inicio_texto = campo(linha, 'data') or campo(linha, 'data_inicio')
+    if not inicio_texto:
+        raise ErroIngestao(f'{nome}: sem data')
+    inicio, dia_mes = interpretar_data(inicio_texto)
+
+    if dia_mes or (recorrente and inicio):
+        dia, mes = dia_mes or (inicio.day, inicio.month)
+        return [(escopo, local, f'{dia:02d}/{mes:02d}', nome, tipo, fonte)]
+
+    fim = inicio
+    fim_texto = campo(linha, 'data_fim')
+    if fim_texto:
+        fim, _ = interpretar_data(fim_texto)
+        if fim is None or fim < inicio:
+            raise ErroIngestao(f'{nome}: intervalo inválido {inicio_texto} a {fim_texto}')
+        if (fim - inicio).days >= MAXIMO_DIAS_INTERVALO:
+            raise ErroIngestao(f'{nome}: intervalo maior que {MAXIMO_DIAS_INTERVALO} dias')
+
+    if not 1900 <= inicio.year <= 2100:
+        raise ErroIngestao(f'{nome}: ano fora do intervalo aceito ({inicio.year})')
+
+    registros = []
+    dia = inicio
+    while dia <= fim:
+        registros.append((escopo, local, dia.strftime('%d/%m/%Y'), nome, tipo, fonte))
+        dia += timedelta(days=1)
+    return registros
+
+
+def ler_csv(caminho: str) -> Iterator[Tuple[int, Dict]]:
+    with open(caminho, 'r', encoding='utf-8-sig', newline='') as f:
+        amostra = f.read(4096)
+        f.seek(0)
+        try:
+            dialeto = csv.Sniffer().sniff(amostra, delimiters=',;\t|')
+        except csv.Error:
+            dialeto = csv.excel
+        for numero, linha in enumerate(csv.DictReader(f, dialect=dialeto), start=2):
+            yield numero, linha
+
+
+def linhas_desdobradas(f) -> Iterator[Tuple[int, str]]:
+    """Junta as linhas continuadas do iCalendar (RFC 5545, seção 3.1)"""
+    atual, numero_atual = None, 0
+    for numero, linha in enumerate(f, start=1):
+        linha = linha.rstrip('\r\n')
+        if linha[:1] in (' ', '\t') and atual is not None:
+            atual += linha[1:]
+            continue
+        if atual is not None:
+            yield numero_atual, atual
+        atual, numero_atual = linha, numero
+    if atual is not None:
+        yield numero_atual, atual
+
+
+def data_ics(valor: str, parametros: str) -> Tuple[date, bool]:
+    """Retorna (data, é dia inteiro) de um DTSTART/DTEND"""
+    dia_inteiro = 'VALUE=DATE' in parametros.upper() and 'DATE-TIME' not in parametros.upper()
+    dia_inteiro = dia_inteiro or 'T' not in valor
+    return datetime.strptime(valor[:8], '%Y%m%d').date(), dia_inteiro
+
+
+def ler_ics(caminho: str, canonicos: Dict) -> Iterator[Tuple[int, Dict]]:
+    with open(caminho, 'r', encoding='utf-8-sig') as f:
+        evento = None
+        for numero, linha in linhas_desdobradas(f):
+            propriedade, _, valor = linha.partition(':')
+            nome, _, parametros = propriedade.partition(';')
+            nome = nome.upper()
+
+            if nome == 'BEGIN' and valor.upper() == 'VEVENT':
+                evento = {'_linha': numero}
+            elif evento is None:
+                continue
+            elif nome == 'END' and valor.upper() == 'VEVENT':
+                yield evento.pop('_linha'), evento
+                evento = None
+            elif nome == 'SUMMARY':
+                evento['nome'] = re.sub(r'\\([,;\\])', r'\1', valor).replace('\\n', ' ')
+            elif nome in ('DTSTART', 'DTEND'):
+                try:
+                    dia, dia_inteiro = data_ics(valor, parametros)
+                except ValueError:
+                    evento['data'] = valor  # rejeitado na validação
+                    continue
+                if nome == 'DTSTART':
+                    evento['data'] = dia.isoformat()
+                else:
+                    # DTEND de dia inteiro é exclusivo
+                    evento['_fim'] = (dia - timedelta(days=1) if dia_inteiro else dia)
+            elif nome == 'RRULE' and 'FREQ=YEARLY' in valor.upper():
+                evento['recorrente'] = 'sim'
+            elif nome == 'X-JURISCONTA-ESTADO':
+                evento['estado'] = valor
+            elif nome == 'X-JURISCONTA-MUNICIPIO':
+                evento['municipio'] = valor
+            elif nome == 'X-JURISCONTA-TIPO':
+                evento['tipo'] = valor
+            elif nome == 'LOCATION' and valor:
+                chave = sem_acentos(valor)
+                if chave in canonicos['estados']:
+                    evento.setdefault('estado', valor)
+                elif chave in canonicos['municipios']:
+                    evento.setdefault('municipio', valor)
+
+            if evento is not None and '_fim' in evento and 'data' in evento:
+                fim = evento.pop('_fim')
+                if fim.isoformat() != evento['data']:
+                    evento['data_fim'] = fim.isoformat()
+
+
+def ler_json(caminho: str) -> Iterator[Tuple[int, Any]]:
+    """JSON Lines é lido em streaming; arquivos .json são lidos inteiros
+
+    Os itens não são validados aqui: além de objetos, podem vir valores de outro
+    tipo ou um ErroIngestao (linha de JSON Lines malformada, seção do feriados.json
+    com tipo errado), que normalizar_linha rejeita como linha inválida sem
+    interromper a leitura das seguintes.
+    """
+    if caminho.lower().endswith(('.jsonl', '.ndjson')):
+        with open(caminho, 'r', encoding='utf-8-sig') as f:
+            for numero, linha in enumerate(f, start=1):
+                if linha.strip():
+                    try:
+                        yield numero, json.loads(linha)
+                    except json.JSONDecodeError as e:
+                        yield numero, ErroIngestao(f'JSON inválido: {e.msg}')
+        return
+
+    with open(caminho, 'r', encoding='utf-8-sig') as f:
+        dados = json.load(f)
+
+    if isinstance(dados, list):
+        for numero, linha in enumerate(dados, start=1):
+            yield numero, linha
+        return
+    if not isinstance(dados, dict):
+        yield 1, dados
+        return
+
+    # Mesmo formato do feriados.json; seção com tipo errado conta como uma linha inválida
+    numero = 0
+
+    def lista(valor, nome: str, **campos) -> Iterator[Tuple[int, Any]]:
+        nonlocal numero
+        if not isinstance(valor, list):
+            numero += 1
+            yield numero, ErroIngestao(f'Seção {nome} deveria ser uma lista')
+            return
+        for feriado in valor:
+            numero += 1
+            yield numero, dict(feriado, **campos) if isinstance(feriado, dict) else feriado
+
+    for secao in ('nacionais', 'moveis'):
+        yield from lista(dados.get(secao, []), secao, escopo='nacional')
+    for secao, escopo, campo_local in (('estaduais', 'estadual', 'estado'),
+                                       ('municipais', 'municipal', 'municipio')):
+        locais = dados.get(secao, {})
+        if not isinstance(locais, dict):
+            numero += 1
+            yield numero, ErroIngestao(f'Seção {secao} deveria ser um objeto ({campo_local}: lista)')
+            continue
+        for local, feriados_local in locais.items():
+            yield from lista(feriados_local, f'{secao}.{local}', escopo=escopo, **{campo_local: local})
+
+
+def processar_arquivo(caminho: str, padroes: Dict, canonicos: Dict) -> Dict:
+    """Lê, normaliza, valida e deduplica um arquivo (executado em paralelo)"""
+    padroes = dict(padroes)
+    padroes.setdefault('fonte', os.path.basename(caminho))
+    extensao = os.path.splitext(caminho)[1].lower()
+
+    if extensao == '.csv' or extensao == '.tsv':
+        linhas = ler_csv(caminho)
+    elif extensao in ('.ics', '.ical'):
+        linhas = ler_ics(caminho, canonicos)
+    elif extensao in ('.json', '.jsonl', '.ndjson'):
+        linhas = ler_json(caminho)
+    else:
+        return {'registros': {}, 'erros': [f'{caminho}: formato não suportado'],
+                'lidos': 0, 'duplicados': 0, 'invalidos': 0}
+
+    registros: Dict[Tuple[str, str, str], Registro] = {}
+    erros: List[str] = []
+    lidos = duplicados = invalidos = 0
+    try:
+        for numero, linha in linhas:
+            lidos += 1
+            try:
+                for registro in normalizar_linha(linha, padroes, canonicos):
+                    chave = registro[:3]
+                    if chave in registros:
+                        duplicados += 1
+                    else:
+                        registros[chave] = registro
+            except ErroIngestao as e:
+                invalidos += 1
+                if len(erros) < MAXIMO_ERROS_RELATORIO:
+                    erros.append(f'{os.path.basename(caminho)}:{numero}: {e}')
+    except (OSError, UnicodeDecodeError, json.JSONDecodeError, csv.Error) as e:
+        erros.append(f'{caminho}: {e}')
+
+    return {'registros': registros, 'erros': erros, 'lidos': lidos,
+            'duplicados': duplicados, 'invalidos': invalidos}
+
+
+def mesclar(feriados: Dict, registros: Dict[Tuple[str, str, str], Registro]) -> Tuple[Dict[str, List[Dict]], int]:
+    """Acrescenta ao banco os registros que ainda não existem; retorna (diferenças, já existentes)"""
+    existentes = set()
+    for feriado in feriados.get('nacionais', []) + feriados.get('moveis', []):
+        existentes.add(('nacional', '', feriado.get('data')))
+    for escopo in ('estadual', 'municipal'):
+        for local, lista in feriados.get(SECOES[escopo], {}).items():
+            for feriado in lista:
+                existentes.add((escopo, local, feriado.get('data')))
+
+    diferencas: Dict[str, List[Dict]] = {}
+    ja_existentes = 0
+    for chave in sorted(registros, key=lambda c: (c[0], c[1], c[2][6:], c[2][3:5], c[2][:2])):
+        escopo, local, data, nome, tipo, fonte = registros[chave]
+        # Um feriado anual (dd/mm) já cobre a mesma data em qualquer ano
+        if chave in existentes or (escopo, local, data[:5]) in existentes:
+            ja_existentes += 1
+            continue
+
+        feriado = {'data': data, 'nome': nome}
+        if tipo != 'feriado':
+            feriado['tipo'] = tipo
+        if fonte:
+            feriado['fonte'] = fonte
+
+        secao = SECOES[escopo]
+        if escopo == 'nacional':
+            feriados.setdefault(secao, []).append(feriado)
+            rotulo = secao
+        else:
+            feriados.setdefault(secao, {}).setdefault(local, []).append(feriado)
+            rotulo = f'{secao}/{local}'
+        diferencas.setdefault(rotulo, []).append(feriado)
+        existentes.add(chave)
+
+    return diferencas, ja_existentes
+
+
+def ingerir(arquivos: List[str], destino: str = prazos.ARQUIVO_FERIADOS, padroes: Optional[Dict] = None,
+            simular: bool = False, processos: Optional[int] = None) -> Dict:
+    """Processa os arquivos em paralelo, mescla no banco e retorna o relatório de diferenças"""
+    padroes = padroes or {}
+    feriados = prazos.carregar_feriados(destino)
+    canonicos = montar_canonicos(feriados)
+
+    if len(arquivos) > 1 and processos != 1:
+        with ProcessPoolExecutor(max_workers=processos) as executor:
+            parciais = list(executor.map(processar_arquivo, arquivos,
+                                         [padroes] * len(arquivos), [canonicos] * len(arquivos)))
+    else:
+        parciais = [processar_arquivo(arquivo, padroes, canonicos) for arquivo in arquivos]
+
+    registros: Dict[Tuple[str, str, str], Registro] = {}
+    duplicados = 0
+    for parcial in parciais:
+        duplicados += parcial['duplicados']
+        for chave, registro in parcial['registros'].items():
+            if chave in registros:
+                duplicados += 1
+            else:
+                registros[chave] = registro
+
+    locais_antes = {escopo: set(feriados.get(SECOES[escopo], {})) for escopo in ('estadual', 'municipal')}
+    diferencas, ja_existentes = mesclar(feriados, registros)
+    novas_jurisdicoes = sorted(
+        f'{SECOES[escopo]}/{local}'
+        for escopo in ('estadual', 'municipal')
+        for local in set(feriados.get(SECOES[escopo], {})) - locais_antes[escopo]
+    )
+
+    adicionados = sum(len(lista) for lista in diferencas.values())
+    if adicionados and not simular:
+        prazos.salvar_feriados(feriados, destino)
+
+    erros = [erro for parcial in parciais for erro in parcial['erros']]
+    return {
+        'arquivos': len(arquivos),
+        'linhas_lidas': sum(parcial['lidos'] for parcial in parciais),
+        'registros_validos': len(registros) + duplicados,
+        'invalidos': sum(parcial['invalidos'] for parcial in parciais),
+        'duplicados': duplicados,
+        'ja_existentes': ja_existentes,
+        'adicionados': adicionados,
+        'gravado': bool(adicionados and not simular),
+        'novas_jurisdicoes': novas_jurisdicoes,
+        'diferencas': diferencas,
+        'erros': erros[:MAXIMO_ERROS_RELATORIO]
+    }
+
+
+def exibir_relatorio(relatorio: Dict):
+    linhas = []
+    for rotulo, lista in sorted(relatorio['diferencas'].items()):
+        for feriado in lista:
+            detalhe = ' (suspensão)' if feriado.get('tipo') == 'suspensao' else ''
+            linhas.append(f"+ {rotulo:<40} {feriado['data']:<10} {feriado['nome']}{detalhe}")
+    if len(linhas) > MAXIMO_LINHAS_DIFERENCA:
+        restantes = len(linhas) - MAXIMO_LINHAS_DIFERENCA
+        linhas = linhas[:MAXIMO_LINHAS_DIFERENCA] + [f'... e mais {restantes} (use --relatorio)']
+    for erro in relatorio['erros']:
+        linhas.append(f'! {erro}')
+    linhas.append('')
+    linhas.append(f"Arquivos: {relatorio['arquivos']}  Linhas lidas: {relatorio['linhas_lidas']}  "
+                  f"Inválidas: {relatorio['invalidos']}  Duplicadas: {relatorio['duplicados']}")
+    linhas.append(f"Já existentes: {relatorio['ja_existentes']}  Adicionados: {relatorio['adicionados']}  "
+                  f"Novas jurisdições: {len(relatorio['novas_jurisdicoes'])}")
+    if relatorio['adicionados']:
+        linhas.append('Banco de feriados atualizado.' if relatorio['gravado']
+                      else 'Simulação: nenhuma alteração gravada.')
+    else:
+        linhas.append('Nenhuma alteração.')
+    print('\n'.join(linhas))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Importa feriados e suspensões para o JurisConta')
+    parser.add_argument('arquivos', nargs='+', help='Arquivos CSV, ICS, JSON ou JSON Lines')
+    parser.add_argument('--destino', default=prazos.ARQUIVO_FERIADOS, help='Banco de feriados a atualizar')
+    parser.add_argument('--estado', help='Estado aplicado às linhas sem jurisdição')
+    parser.add_argument('--municipio', help='Município aplicado às linhas sem jurisdição')
+    parser.add_argument('--tipo', choices=['feriado', 'suspensao'], help='Tipo padrão dos registros')
+    parser.add_argument('--fonte', help='Fonte registrada (padrão: nome do arquivo)')
+    parser.add_argument('--processos', type=int, help='Processos de leitura em paralelo')
+    parser.add_argument('--simular', action='store_true', help='Mostra as diferenças sem gravar')
+    parser.add_argument('--relatorio', help='Grava o relatório de diferenças em JSON')
+    args = parser.parse_args()
+
+    padroes = {chave: valor for chave, valor in
+               (('estado', args.estado), ('municipio', args.municipio),
+                ('tipo', args.tipo), ('fonte', args.fonte)) if valor}
+    relatorio = ingerir(args.arquivos, args.destino, padroes, args.simular, args.processos)
+    exibir_relatorio(relatorio)
+
+    if args.relatorio:
+        with open(args.relatorio, 'w', encoding='utf-8') as f:
+            json.dump(relatorio, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == '__main__':
+    main()
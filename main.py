@@ -3,12 +3,15 @@ JurisConta - Calculadora de Prazos Processuais
 Calcula prazos legais considerando CPC, feriados e regras processuais
 """
 
+import argparse
 import json
 from datetime import datetime, timedelta
 from typing import Optional, List, Dict
 import os
 import sys
 
+import prazos
+
 # Cores ANSI para terminal
 class Cores:
     """Cores ANSI para formatação no terminal"""
@@ -127,4 +130,189 @@ def exibir_logo():
 """
     print(logo)
 
+
+# Cor de cada status na tabela de resultados
+CORES_STATUS = {
+    'VENCIDO': Cores.VERMELHO,
+    'VENCE HOJE': Cores.VERMELHO,
+    'VENCE EM BREVE': Cores.AMARELO,
+    'DENTRO DO PRAZO': Cores.VERDE
+}
+
+# Linhas inválidas listadas uma a uma no aviso após a tabela
+MAXIMO_INVALIDOS = 20
+
+# (chave, título, largura, alinhamento)
+COLUNAS_TABELA = [
+    ('id', 'Identificação', 24, '<'),
+    ('data_publicacao', 'Publicação', 10, '<'),
+    ('prazo', 'Prazo', 5, '>'),
+    ('tipo', 'Tipo', 8, '<'),
+    ('municipio', 'Município', 22, '<'),
+    ('estado', 'Estado', 19, '<'),
+    ('data_inicio', 'Início', 10, '<'),
+    ('data_vencimento', 'Vencimento', 10, '<'),
+    ('dias_restantes', 'Restam', 6, '>'),
+    ('status', 'Status', 15, '<')
+]
+
+
+def saida_colorida(saida=None) -> bool:
+    """Cores só em terminal interativo e sem a variável NO_COLOR"""
+    saida = saida or sys.stdout
+    return hasattr(saida, 'isatty') and saida.isatty() and 'NO_COLOR' not in os.environ
+
+
+def preparar_resultados(resultados, filtro_status: Optional[List[str]] = None,
+                        ordenar: Optional[str] = 'asc') -> List[Dict]:
+    """Filtra por status e ordena por dias_restantes ('asc', 'desc' ou None)"""
+    if filtro_status:
+        filtro = {status.upper() for status in filtro_status}
+        resultados = [r for r in resultados if r.get('status') in filtro]
+    else:
+        resultados = [r for r in resultados if 'erro' not in r]
+    if ordenar:
+        resultados = sorted(resultados, key=lambda r: r.get('dias_restantes', 0),
+                            reverse=(ordenar == 'desc'))
+    return resultados
+
+
+def exibir_invalidos(invalidos: List[tuple], saida=None):
+    """Resumo das linhas com erro: quantidade, número da linha, id e motivo"""
+    saida = saida or sys.stderr
+    cores = saida_colorida(saida)
+    vermelho, reset = (Cores.VERMELHO + Cores.BOLD, Cores.RESET) if cores else ('', '')
+    total = len(invalidos)
+    texto = [f"{vermelho}✗ {total} {'linha inválida' if total == 1 else 'linhas inválidas'}{reset}"]
+    for numero, resultado in invalidos[:MAXIMO_INVALIDOS]:
+        identificacao = f" ({resultado['id']})" if resultado.get('id') else ''
+        texto.append(f"  linha {numero}{identificacao}: {resultado['erro']} - "
+                     f"publicação {resultado.get('data_publicacao', '')!r}, prazo {resultado.get('prazo', '')!r}")
+    if total > MAXIMO_INVALIDOS:
+        texto.append(f'  ... e mais {total - MAXIMO_INVALIDOS}')
+    saida.write('\n'.join(texto) + '\n')
+    saida.flush()
+
+
+def exibir_tabela(resultados, por_pagina: int = 40, filtro_status: Optional[List[str]] = None,
+                  ordenar: Optional[str] = 'asc', saida=None, paginar: Optional[bool] = None,
+                  avisos=None):
+    """Exibe resultados em tabela, montando cada página inteira antes de escrevê-la
+
+    Em terminal interativo, pagina com Enter/q; fora dele (pipe ou arquivo),
+    escreve tudo sem cores, em blocos grandes. Linhas com erro não entram na
+    tabela e são resumidas em avisos (padrão: saída de erro).
+    """
+    saida = saida or sys.stdout
+    cores = saida_colorida(saida)
+    # Paginar exige ler Enter/q do teclado: saída e entrada precisam ser terminais
+    interativo = paginar if paginar is not None else (
+        hasattr(saida, 'isatty') and saida.isatty() and sys.stdin is not None and sys.stdin.isatty())
+    resultados = list(resultados)
+    # Número da linha no arquivo (ler_lote); para listas montadas em memória, a posição
+    invalidos = [(r.get('linha_arquivo', posicao), r)
+                 for posicao, r in enumerate(resultados, start=1) if 'erro' in r]
+    _escrever_tabela(preparar_resultados(resultados, filtro_status, ordenar),
+                     por_pagina, saida, cores, interativo)
+    if invalidos:
+        exibir_invalidos(invalidos, avisos)
+
+
+def _escrever_tabela(linhas: List[Dict], por_pagina: int, saida, cores: bool, interativo: bool):
+    """Escreve as páginas da tabela já filtrada e ordenada"""
+    if not interativo:
+        por_pagina = max(por_pagina, 5000)
+
+    # Colunas preenchidas em alguma linha do lote (não só nas primeiras)
+    colunas = [c for c in COLUNAS_TABELA if any(r.get(c[0]) not in (None, '') for r in linhas)]
+    if not colunas:
+        saida.write('Nenhum resultado.\n')
+        return
+
+    # Uma string de formatação para a linha inteira; o status é colorido à parte
+    formato = ' '.join(f'{{{i}:{alinhamento}{largura}.{largura}}}'
+                       for i, (_, _, largura, alinhamento) in enumerate(colunas[:-1]))
+    ultima = colunas[-1]
+    largura_total = sum(c[2] for c in colunas) + len(colunas) - 1
+    negrito, reset, dim = (Cores.BOLD, Cores.RESET, Cores.DIM) if cores else ('', '', '')
+    cabecalho = (f"{negrito}{formato.format(*[c[1] for c in colunas[:-1]])} {ultima[1]}{reset}\n"
+                 f"{dim}{'─' * largura_total}{reset}\n")
+    chaves = [c[0] for c in colunas[:-1]]
+
+    def formatar(resultado: Dict) -> str:
+        texto = formato.format(*[str(resultado.get(chave, '')) for chave in chaves])
+        final = str(resultado.get(ultima[0], ''))
+        if cores and ultima[0] == 'status':
+            final = f"{CORES_STATUS.get(final, '')}{final}{reset}"
+        return f'{texto} {final}'
+
+    total_paginas = (len(linhas) + por_pagina - 1) // por_pagina
+    for pagina in range(total_paginas):
+        bloco = linhas[pagina * por_pagina:(pagina + 1) * por_pagina]
+        texto = '\n'.join(map(formatar, bloco)) + '\n'
+        if interativo or pagina == 0:
+            texto = cabecalho + texto
+        saida.write(texto)
+
+        if interativo and pagina < total_paginas - 1:
+            saida.write(f"{dim}-- página {pagina + 1}/{total_paginas} "
+                        f"({len(linhas)} resultados) - Enter: próxima, q: sair --{reset}")
+            saida.flush()
+            try:
+                resposta = input()
+            except EOFError:
+                saida.write('\n')
+                break
+            if resposta.strip().lower() == 'q':
+                break
+    saida.flush()
+
+
+def exibir_lote(caminho_csv: str, caminho_feriados: str = prazos.ARQUIVO_FERIADOS, **opcoes):
+    """Calcula um lote de prazos em CSV e exibe a tabela de resultados"""
+    feriados = prazos.carregar_feriados(caminho_feriados)
+    resultados = list(prazos.calcular_lote(feriados, prazos.ler_lote(caminho_csv)))
+    exibir_tabela(resultados, **opcoes)
+
+
+# Valores aceitos em --status na linha de comando
+STATUS_LINHA_COMANDO = {
+    'vencido': 'VENCIDO',
+    'vence-hoje': 'VENCE HOJE',
+    'vence-em-breve': 'VENCE EM BREVE',
+    'dentro-do-prazo': 'DENTRO DO PRAZO'
+}
+
+
+def main_lote(argumentos: Optional[List[str]] = None) -> int:
+    """python main.py lote arquivo.csv [--status ...] [--ordem desc] [--por-pagina N]"""
+    parser = argparse.ArgumentParser(prog='main.py lote',
+                                     description='Calcula um lote de prazos (CSV) e exibe a tabela de resultados')
+    parser.add_argument('arquivo', help='CSV com data_publicacao, prazo, tipo, estado, municipio e id')
+    parser.add_argument('--status', action='append', choices=sorted(STATUS_LINHA_COMANDO),
+                        help='Mostra só os prazos com este status (pode repetir)')
+    parser.add_argument('--ordem', choices=['asc', 'desc', 'arquivo'], default='asc',
+                        help='Ordena por dias restantes ou mantém a ordem do arquivo (padrão: asc)')
+    parser.add_argument('--por-pagina', type=int, default=40, help='Linhas por página no terminal')
+    parser.add_argument('--feriados', default=prazos.ARQUIVO_FERIADOS, help='Banco de feriados')
+    args = parser.parse_args(argumentos)
+
+    if not os.path.exists(args.arquivo):
+        parser.error(f'arquivo não encontrado: {args.arquivo}')
+    try:
+        exibir_lote(args.arquivo, args.feriados,
+                    por_pagina=max(args.por_pagina, 1),
+                    filtro_status=[STATUS_LINHA_COMANDO[s] for s in args.status or []],
+                    ordenar=None if args.ordem == 'arquivo' else args.ordem)
+    except BrokenPipeError:
+        # Saída encerrada antes do fim (ex.: | head); não é erro
+        sys.stderr.close()
+    return 0
+
+
 # ... existing code ...
+
+
+if __name__ == '__main__' and sys.argv[1:2] == ['lote']:
+    # python main.py lote arquivo.csv [...]
+    sys.exit(main_lote(sys.argv[2:]))
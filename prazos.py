@@ -0,0 +1,337 @@
+"""
+JurisConta - Motor de Prazos
+Regras de contagem de prazos compartilhadas pelas interfaces (GUI, CLI e web)
+"""
+
+import calendar
+import csv
+import hashlib
+import json
+import os
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Banco de feriados distribuído junto com o código
+ARQUIVO_FERIADOS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'feriados.json')
+
+DIAS_SEMANA = ['segunda-feira', 'terça-feira', 'quarta-feira',
+               'quinta-feira', 'sexta-feira', 'sábado', 'domingo']
+
+MESES = ['Janeiro', 'Fevereiro', 'Março', 'Abril', 'Maio', 'Junho', 'Julho',
+         'Agosto', 'Setembro', 'Outubro', 'Novembro', 'Dezembro']
+
+
+def carregar_feriados(caminho: str = ARQUIVO_FERIADOS) -> Dict:
+    """Carrega feriados do arquivo JSON"""
+    try:
+        with open(caminho, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {
+            'nacionais': [],
+            'moveis': [],
+            'estaduais': {},
+            'municipais': {}
+        }
+
+
+def assinatura_arquivo(caminho: str = ARQUIVO_FERIADOS) -> Tuple[int, int]:
+    """(mtime, tamanho) do arquivo: verificação barata de alteração a cada consulta"""
+    try:
+        info = os.stat(caminho)
+        return info.st_mtime_ns, info.st_size
+    except FileNotFoundError:
+        return 0, 0
+
+
+def versao_arquivo(caminho: str = ARQUIVO_FERIADOS) -> str:
+    """Hash do conteúdo do arquivo, usado como versão do banco de feriados"""
+    try:
+        with open(caminho, 'rb') as f:
+            conteudo = f.read()
+    except FileNotFoundError:
+        conteudo = b''
+    return hashlib.sha256(conteudo).hexdigest()[:16]
+
+
+def salvar_feriados(feriados: Dict, caminho: str = ARQUIVO_FERIADOS):
+    """Grava o banco de feriados no mesmo layout do arquivo original (um feriado por linha)"""
+    def entrada(feriado: Dict) -> str:
+        return json.dumps(feriado, ensure_ascii=False)
+
+    def lista(feriados_lista: List[Dict], recuo: str) -> List[str]:
+        return [f'{recuo}{entrada(f)}' + (',' if i < len(feriados_lista) - 1 else '')
+                for i, f in enumerate(feriados_lista)]
+
+    linhas = ['{']
+    secoes = list(feriados.items())
+    for i, (secao, valor) in enumerate(secoes):
+        fim_secao = ',' if i < len(secoes) - 1 else ''
+        if isinstance(valor, dict):
+            linhas.append(f'  {json.dumps(secao, ensure_ascii=False)}: {{')
+            grupos = list(valor.items())
+            for j, (local, itens) in enumerate(grupos):
+                linhas.append(f'    {json.dumps(local, ensure_ascii=False)}: [')
+                linhas.extend(lista(itens, '      '))
+                linhas.append('    ]' + (',' if j < len(grupos) - 1 else ''))
+            linhas.append('  }' + fim_secao)
+        else:
+            linhas.append(f'  {json.dumps(secao, ensure_ascii=False)}: [')
+            linhas.extend(lista(valor, '    '))
+            linhas.append('  ]' + fim_secao)
+    linhas.append('}')
+
+    # Grava em arquivo temporário e substitui, para leitores nunca verem o arquivo pela metade
+    temporario = f'{caminho}.tmp'
+    with open(temporario, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(linhas) + '\n')
+    os.replace(temporario, caminho)
+
+
+class Calendario:
+    """Índice compilado dos dias não úteis de uma jurisdição
+
+    Junta feriados nacionais, móveis, estaduais e municipais em dois dicionários
+    (datas anuais e datas de um ano específico), para responder consultas por
+    intervalo sem percorrer as listas do banco a cada dia.
+    """
+
+    def __init__(self, feriados: Dict, estado: str = '', municipio: str = ''):
+        self.estado = estado
+        self.municipio = municipio
+        self.anuais: Dict[Tuple[int, int], List[Dict]] = {}
+        self.datados: Dict[date, List[Dict]] = {}
+
+        # Móveis só valem com o ano completo (dd/mm/aaaa)
+        for feriado in feriados.get('moveis', []):
+            if str(feriado.get('data', '')).count('/') == 2:
+                self._indexar(feriado)
+
+        listas = [feriados.get('nacionais', [])]
+        if estado:
+            listas.append(feriados.get('estaduais', {}).get(estado, []))
+        if municipio:
+            listas.append(feriados.get('municipais', {}).get(municipio, []))
+
+        for lista in listas:
+            for feriado in lista:
+                self._indexar(feriado)
+
+    def _indexar(self, feriado: Dict):
+        partes = str(feriado.get('data', '')).split('/')
+        try:
+            if len(partes) == 2:
+                chave = (int(partes[1]), int(partes[0]))
+                self.anuais.setdefault(chave, []).append(feriado)
+            elif len(partes) == 3:
+                chave = date(int(partes[2]), int(partes[1]), int(partes[0]))
+                self.datados.setdefault(chave, []).append(feriado)
+        except ValueError:
+            pass  # Data malformada no banco: ignorada
+
+    def e_feriado(self, dia: date) -> bool:
+        """Verifica se é feriado ou suspensão (dd/mm vale todo ano; dd/mm/aaaa, só naquele ano)"""
+        return (dia.month, dia.day) in self.anuais or dia in self.datados
+
+    def e_dia_util(self, dia: date) -> bool:
+        """Verifica se é dia útil"""
+        if dia.weekday() in [5, 6]:
+            return False
+        return not self.e_feriado(dia)
+
+    def dias_nao_uteis(self, inicio: date, fim: date) -> List[Dict]:
+        """Todos os dias não úteis entre inicio e fim (inclusive), com o motivo"""
+        resultado = []
+        dia = inicio
+        um_dia = timedelta(days=1)
+        while dia <= fim:
+            feriados_dia = self.anuais.get((dia.month, dia.day))
+            datados = self.datados.get(dia)
+            if datados:
+                feriados_dia = (feriados_dia or []) + datados
+            fim_de_semana = dia.weekday() >= 5
+
+            if feriados_dia or fim_de_semana:
+                motivos = [f['nome'] for f in feriados_dia or []]
+                if fim_de_semana:
+                    motivos.insert(0, DIAS_SEMANA[dia.weekday()].capitalize())
+                if not feriados_dia:
+                    tipo = 'fim_de_semana'
+                elif all(f.get('tipo') == 'suspensao' for f in feriados_dia):
+                    tipo = 'suspensao'
+                else:
+                    tipo = 'feriado'
+                resultado.append({'data': dia, 'motivo': ' / '.join(motivos), 'tipo': tipo})
+            dia += um_dia
+        return resultado
+
+    def calcular_vencimento(self, data_pub: date, prazo_dias: int,
+                            tipo_prazo: str) -> Tuple[date, date]:
+        """Retorna (início da contagem, vencimento) a partir da data de publicação"""
+        um_dia = timedelta(days=1)
+        data_inicio = data_pub + um_dia
+
+        # Ajusta para primeiro dia útil
+        while not self.e_dia_util(data_inicio):
+            data_inicio += um_dia
+
+        data_vencimento = data_inicio
+        if tipo_prazo == 'uteis':
+            dias_contados = 0
+            while dias_contados < prazo_dias:
+                if self.e_dia_util(data_vencimento):
+                    dias_contados += 1
+                if dias_contados < prazo_dias:
+                    data_vencimento += um_dia
+        else:
+            data_vencimento += timedelta(days=prazo_dias - 1)
+            while not self.e_dia_util(data_vencimento):
+                data_vencimento += um_dia
+
+        return data_inicio, data_vencimento
+
+
+def e_feriado(feriados: Dict, data: date, estado: str = '', municipio: str = '') -> bool:
+    """Verifica se é feriado (para muitas datas, prefira um Calendario reaproveitado)"""
+    return Calendario(feriados, estado, municipio).e_feriado(_como_date(data))
+
+
+def e_dia_util(feriados: Dict, data: date, estado: str = '', municipio: str = '') -> bool:
+    """Verifica se é dia útil (para muitas datas, prefira um Calendario reaproveitado)"""
+    return Calendario(feriados, estado, municipio).e_dia_util(_como_date(data))
+
+
+def _como_date(data: date) -> date:
+    return data.date() if isinstance(data, datetime) else data
+
+
+def grade_mes(ano: int, mes: int) -> List[List[Optional[date]]]:
+    """Semanas do mês (domingo a sábado), com None nos dias de outros meses"""
+    semanas = calendar.Calendar(firstweekday=6).monthdatescalendar(ano, mes)
+    return [[dia if dia.month == mes else None for dia in semana] for semana in semanas]
+
+
+def dias_contados(data_inicio: date, data_vencimento: date, tipo_prazo: str,
+                  nao_uteis: Dict[date, Dict]) -> List[date]:
+    """Dias que entram na contagem do prazo (úteis, ou todos nos prazos corridos)"""
+    dias = []
+    dia = data_inicio
+    while dia <= data_vencimento:
+        if tipo_prazo != 'uteis' or dia not in nao_uteis:
+            dias.append(dia)
+        dia += timedelta(days=1)
+    return dias
+
+
+def calcular_vencimento(feriados: Dict, data_pub: datetime, prazo_dias: int,
+                        tipo_prazo: str, estado: str = '', municipio: str = '') -> Tuple[datetime, datetime]:
+    """Retorna (início da contagem, vencimento) a partir da data de publicação
+
+    A regra de contagem fica em Calendario.calcular_vencimento; aqui só se
+    preserva a interface com datetime.
+    """
+    data_inicio, data_vencimento = Calendario(feriados, estado, municipio).calcular_vencimento(
+        data_pub.date(), prazo_dias, tipo_prazo)
+    return (datetime.combine(data_inicio, datetime.min.time()),
+            datetime.combine(data_vencimento, datetime.min.time()))
+
+
+def obter_dia_semana(data: datetime) -> str:
+    """Retorna dia da semana"""
+    return DIAS_SEMANA[data.weekday()]
+
+
+def obter_status(dias_restantes: int) -> str:
+    """Retorna status do prazo"""
+    if dias_restantes < 0:
+        return 'VENCIDO'
+    elif dias_restantes == 0:
+        return 'VENCE HOJE'
+    elif dias_restantes <= 3:
+        return 'VENCE EM BREVE'
+    else:
+        return 'DENTRO DO PRAZO'
+
+
+def montar_resultado(data_inicio: date, data_vencimento: date, hoje: Optional[date] = None) -> Dict:
+    """Monta o dicionário de resultado, com dias restantes contados a partir de hoje"""
+    hoje = hoje or datetime.now().date()
+    vencimento = data_vencimento.date() if isinstance(data_vencimento, datetime) else data_vencimento
+    dias_restantes = (vencimento - hoje).days
+
+    return {
+        'data_inicio': data_inicio.strftime('%d/%m/%Y'),
+        'data_vencimento': data_vencimento.strftime('%d/%m/%Y'),
+        'dia_semana': obter_dia_semana(data_vencimento),
+        'dias_restantes': dias_restantes,
+        'status': obter_status(dias_restantes)
+    }
+
+
+def calcular_prazo(feriados: Dict, data_publicacao: str, prazo_dias: int,
+                   tipo_prazo: str, estado: str = '', municipio: str = '') -> Dict:
+    """Calcula o prazo"""
+    try:
+        data_pub = datetime.strptime(data_publicacao, '%d/%m/%Y')
+    except ValueError:
+        return {'erro': 'Data inválida. Use o formato dd/mm/aaaa'}
+
+    data_inicio, data_vencimento = calcular_vencimento(
+        feriados, data_pub, prazo_dias, tipo_prazo, estado, municipio)
+    return montar_resultado(data_inicio, data_vencimento)
+
+
+def ler_lote(caminho: str) -> Iterator[Dict]:
+    """Linhas do CSV de prazos, com nomes de coluna em minúsculas
+
+    Cada linha traz linha_arquivo, o número da linha no arquivo (o cabeçalho é a
+    linha 1), para que erros apontem a mesma linha que o ingestao.py.
+    """
+    with open(caminho, 'r', encoding='utf-8-sig', newline='') as f:
+        amostra = f.read(4096)
+        f.seek(0)
+        try:
+            dialeto = csv.Sniffer().sniff(amostra, delimiters=',;\t|')
+        except csv.Error:
+            dialeto = csv.excel
+        for numero, linha in enumerate(csv.DictReader(f, dialect=dialeto), start=2):
+            linha = {str(k).strip().lower(): (v or '').strip() for k, v in linha.items() if k}
+            linha['linha_arquivo'] = numero
+            linha.setdefault('data_publicacao', linha.get('data', ''))
+            if not linha.get('id'):
+                linha['id'] = linha.get('processo', '')
+            yield linha
+
+
+def calcular_lote(feriados: Dict, linhas: Iterable[Dict]) -> Iterator[Dict]:
+    """Calcula uma sequência de prazos reaproveitando um índice compilado por jurisdição
+
+    Cada linha traz data_publicacao, prazo, tipo, estado e municipio (e, opcionalmente,
+    id); o resultado repete os campos da linha junto com os de calcular_prazo.
+    """
+    calendarios: Dict[Tuple[str, str], Calendario] = {}
+    hoje = datetime.now().date()
+    for linha in linhas:
+        estado = linha.get('estado') or ''
+        municipio = linha.get('municipio') or ''
+        tipo = 'corridos' if str(linha.get('tipo', '')).startswith('corr') else 'uteis'
+        entrada = dict(linha,
+                       id=linha.get('id', ''),
+                       data_publicacao=linha.get('data_publicacao', ''),
+                       prazo=linha.get('prazo', ''),
+                       tipo=tipo,
+                       estado=estado,
+                       municipio=municipio)
+        try:
+            data_pub = datetime.strptime(entrada['data_publicacao'], '%d/%m/%Y').date()
+            prazo_dias = entrada['prazo'] = int(entrada['prazo'])
+        except (TypeError, ValueError):
+            yield dict(entrada, erro='Data ou prazo inválido')
+            continue
+
+        chave = (estado, municipio)
+        if chave not in calendarios:
+            calendarios[chave] = Calendario(feriados, estado, municipio)
+        data_inicio, data_vencimento = calendarios[chave].calcular_vencimento(data_pub, prazo_dias, tipo)
+        entrada.update(montar_resultado(data_inicio, data_vencimento, hoje))
+        yield entrada
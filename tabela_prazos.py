@@ -0,0 +1,279 @@
+"""
+JurisConta - Tabela Materializada de Prazos
+Pré-calcula, em segundo plano, o vencimento das combinações mais consultadas
+(prazo, tipo, jurisdição e data de publicação). Consultas cobertas pela tabela
+são respondidas por indexação direta em arrays; as demais caem no motor geral.
+"""
+
+import threading
+import time
+from array import array
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import prazos
+
+PRAZOS_PADRAO = (5, 10, 15, 30)
+TIPOS_PADRAO = ('uteis', 'corridos')
+DIAS_PADRAO = 730
+
+# A janela começa um pouco antes de hoje: boa parte das consultas é de publicações recentes
+DIAS_RETROATIVOS = 90
+
+# Offsets (em dias, a partir da publicação) cabem em inteiros sem sinal de 16 bits
+TIPO_ARRAY = 'H'
+OFFSET_MAXIMO = 2 ** 16 - 1
+
+
+def interpretar_jurisdicoes(texto: str) -> List[Tuple[str, str]]:
+    """Converte "Estado/Município;Estado;..." em pares (estado, município)"""
+    jurisdicoes = []
+    for item in texto.split(';'):
+        if item.strip():
+            estado, _, municipio = item.partition('/')
+            jurisdicoes.append((estado.strip(), municipio.strip()))
+    return jurisdicoes
+
+
+class TabelaPrazos:
+    """Vencimentos pré-calculados por (prazo, tipo, estado, município) e data de publicação"""
+
+    def __init__(self, feriados: Dict, prazos_dias: Iterable[int] = PRAZOS_PADRAO,
+                 tipos: Iterable[str] = TIPOS_PADRAO,
+                 jurisdicoes: Optional[Iterable[Tuple[str, str]]] = None,
+                 inicio: Optional[date] = None, dias: int = DIAS_PADRAO):
+        self.feriados = feriados
+        self.prazos_dias = sorted({int(p) for p in prazos_dias if int(p) > 0})
+        self.tipos = [t for t in tipos if t in TIPOS_PADRAO]
+        if jurisdicoes is None:
+            jurisdicoes = [('', '')] + [(estado, '') for estado in sorted(feriados.get('estaduais', {}))]
+        self.jurisdicoes = list(dict.fromkeys(jurisdicoes))
+        self.inicio = inicio or datetime.now().date() - timedelta(days=DIAS_RETROATIVOS)
+        self.dias = dias
+
+        self.base = self.inicio.toordinal()
+        self.inicios: Dict[Tuple[str, str], array] = {}
+        self.vencimentos: Dict[Tuple[int, str, str, str], array] = {}
+        self.pronta = False
+        self.tempo_construcao = 0.0
+        self.acertos = 0
+        self.falhas = 0
+        self._thread: Optional[threading.Thread] = None
+
+    def iniciar(self) -> 'TabelaPrazos':
+        """Constrói a tabela em uma thread de segundo plano"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self.construir, name='tabela-prazos', daemon=True)
+            self._thread.start()
+        return self
+
+    def aguardar(self, timeout: Optional[float] = None) -> bool:
+        if self._thread is not None:
+            self._thread.join(timeout)
+        return self.pronta
+
+    def construir(self):
+        """Pré-calcula todas as combinações configuradas"""
+        comeco = time.perf_counter()
+        inicios = {}
+        vencimentos = {}
+        for estado, municipio in self.jurisdicoes:
+            calendario = prazos.Calendario(self.feriados, estado, municipio)
+            inicio_arr, por_combinacao = self._construir_jurisdicao(calendario)
+            inicios[(estado, municipio)] = inicio_arr
+            for (prazo, tipo), arr in por_combinacao.items():
+                vencimentos[(prazo, tipo, estado, municipio)] = arr
+
+        # Publica os dicionários prontos de uma vez; leitores nunca veem tabela parcial
+        self.inicios = inicios
+        self.vencimentos = vencimentos
+        self.tempo_construcao = time.perf_counter() - comeco
+        self.pronta = True
+
+    def _construir_jurisdicao(self, calendario: prazos.Calendario):
+        """Varre a janela uma vez e resolve cada prazo com os índices de dias úteis"""
+        maior_prazo = max(self.prazos_dias, default=0)
+        # Folga para o vencimento das últimas publicações (fins de semana e recessos)
+        total = self.dias + 2 * maior_prazo + 90
+        um_dia = timedelta(days=1)
+
+        util = []
+        dia = self.inicio
+        for _ in range(total):
+            util.append(calendario.e_dia_util(dia))
+            dia += um_dia
+
+        # proximo_util[i]: primeiro dia útil em i ou depois; posicao[i]: seu índice entre os úteis
+        proximo_util = [-1] * (total + 1)
+        for i in range(total - 1, -1, -1):
+            proximo_util[i] = i if util[i] else proximo_util[i + 1]
+        uteis = [i for i in range(total) if util[i]]
+        posicao = {indice: n for n, indice in enumerate(uteis)}
+
+        inicio_arr = array(TIPO_ARRAY)
+        por_combinacao = {(p, t): array(TIPO_ARRAY) for p in self.prazos_dias for t in self.tipos}
+        for pub in range(self.dias):
+            inicio = proximo_util[pub + 1]
+            inicio_arr.append(self._offset(inicio, pub, calendario, None, None))
+            for (prazo, tipo), arr in por_combinacao.items():
+                if inicio < 0:
+                    venc = -1
+                elif tipo == 'uteis':
+                    n = posicao[inicio] + prazo - 1
+                    venc = uteis[n] if n < len(uteis) else -1
+                else:
+                    venc = proximo_util[inicio + prazo - 1] if inicio + prazo - 1 < total else -1
+                arr.append(self._offset(venc, pub, calendario, prazo, tipo))
+        return inicio_arr, por_combinacao
+
+    def _offset(self, indice: int, pub: int, calendario: prazos.Calendario,
+                prazo: Optional[int], tipo: Optional[str]) -> int:
+        """Offset a partir da publicação; fora da janela, recorre ao cálculo direto"""
+        if indice < 0:
+            data_pub = self.inicio + timedelta(days=pub)
+            data_inicio, data_venc = calendario.calcular_vencimento(data_pub, prazo or 1, tipo or 'uteis')
+            alvo = data_venc if prazo else data_inicio
+            indice = (alvo - self.inicio).days
+        return min(indice - pub, OFFSET_MAXIMO)
+
+    def consultar(self, data_publicacao: str, prazo_dias: int, tipo_prazo: str,
+                  estado: str = '', municipio: str = '') -> Optional[Dict]:
+        """Resultado no formato de calcular_prazo, ou None se a combinação não está na tabela"""
+        tipo = 'uteis' if tipo_prazo == 'uteis' else 'corridos'
+        vencimentos = self.vencimentos.get((prazo_dias, tipo, estado, municipio))
+        if vencimentos is not None:
+            try:
+                dia, mes, ano = data_publicacao.split('/')
+                pub = date(int(ano), int(mes), int(dia))
+            except ValueError:
+                pub = None
+            if pub is not None:
+                indice = pub.toordinal() - self.base
+                if 0 <= indice < self.dias:
+                    offset_inicio = self.inicios[(estado, municipio)][indice]
+                    offset_venc = vencimentos[indice]
+                    if offset_inicio < OFFSET_MAXIMO and offset_venc < OFFSET_MAXIMO:
+                        self.acertos += 1
+                        return prazos.montar_resultado(pub + timedelta(days=offset_inicio),
+                                                       pub + timedelta(days=offset_venc))
+        self.falhas += 1
+        return None
+
+    def calcular_prazo(self, data_publicacao: str, prazo_dias: int, tipo_prazo: str,
+                       estado: str = '', municipio: str = '') -> Dict:
+        """Consulta a tabela e, fora dela, calcula pelo motor geral"""
+        resultado = self.consultar(data_publicacao, prazo_dias, tipo_prazo, estado, municipio)
+        if resultado is None:
+            resultado = prazos.calcular_prazo(self.feriados, data_publicacao, prazo_dias,
+                                              tipo_prazo, estado, municipio)
+        return resultado
+
+    def estatisticas(self) -> Dict:
+        """Tamanho em memória, cobertura e taxa de acerto"""
+        arrays: List[array] = list(self.inicios.values()) + list(self.vencimentos.values())
+        consultas = self.acertos + self.falhas
+        return {
+            'pronta': self.pronta,
+            'combinacoes': len(self.vencimentos),
+            'jurisdicoes': len(self.jurisdicoes),
+            'publicacoes': f"{self.inicio.strftime('%d/%m/%Y')} a "
+                           f"{(self.inicio + timedelta(days=self.dias - 1)).strftime('%d/%m/%Y')}",
+            'entradas': sum(len(a) for a in self.vencimentos.values()),
+            'memoria_bytes': sum(len(a) * a.itemsize for a in arrays),
+            'tempo_construcao': round(self.tempo_construcao, 3),
+            'acertos': self.acertos,
+            'falhas': self.falhas,
+            'taxa_acerto': self.acertos / consultas if consultas else 0.0
+        }
+
+
+class TabelaAtualizada:
+    """Mantém uma TabelaPrazos de acordo com o banco de feriados e com a data de hoje
+
+    A cada consulta confere a assinatura do feriados.json (como o CachePrazos) e a
+    janela de publicações. Se os feriados mudaram, a tabela antiga deixa de ser
+    usada na hora e uma nova é construída em segundo plano; se só a janela andou,
+    a antiga continua respondendo até a nova ficar pronta.
+    """
+
+    def __init__(self, caminho_feriados: str = prazos.ARQUIVO_FERIADOS, **opcoes):
+        self.caminho_feriados = caminho_feriados
+        self.opcoes = opcoes
+        self.tabela: Optional[TabelaPrazos] = None
+        self.construindo: Optional[TabelaPrazos] = None
+        self.feriados: Dict = {}
+        self.versao = ''
+        self.reconstrucoes = 0
+        self.acertos = 0
+        self.falhas = 0
+        self._assinatura: Optional[Tuple[int, int]] = None
+        self._inicio: Optional[date] = None
+        self._lock = threading.Lock()
+        self.verificar()
+
+    def verificar(self):
+        """Dispara a reconstrução se o arquivo de feriados ou a janela mudaram"""
+        assinatura = prazos.assinatura_arquivo(self.caminho_feriados)
+        inicio = datetime.now().date() - timedelta(days=DIAS_RETROATIVOS)
+        if assinatura == self._assinatura and inicio == self._inicio:
+            return
+
+        with self._lock:
+            if assinatura == self._assinatura and inicio == self._inicio:
+                return
+            mudou = inicio != self._inicio
+            if assinatura != self._assinatura:
+                versao = prazos.versao_arquivo(self.caminho_feriados)
+                if versao != self.versao:
+                    # Vencimentos calculados com os feriados antigos não podem mais ser servidos
+                    self.feriados = prazos.carregar_feriados(self.caminho_feriados)
+                    self.versao = versao
+                    self.tabela = None
+                    mudou = True
+                self._assinatura = assinatura
+            self._inicio = inicio
+            if mudou:
+                self.construindo = TabelaPrazos(self.feriados, inicio=inicio, **self.opcoes).iniciar()
+                self.reconstrucoes += 1
+
+    def _atual(self) -> Optional[TabelaPrazos]:
+        self.verificar()
+        construindo = self.construindo
+        if construindo is not None and construindo.pronta:
+            with self._lock:
+                if self.construindo is construindo:
+                    self.tabela, self.construindo = construindo, None
+        return self.tabela
+
+    def aguardar(self, timeout: Optional[float] = None) -> bool:
+        construindo = self.construindo
+        if construindo is not None:
+            construindo.aguardar(timeout)
+        return self._atual() is not None
+
+    def consultar(self, data_publicacao: str, prazo_dias: int, tipo_prazo: str,
+                  estado: str = '', municipio: str = '') -> Optional[Dict]:
+        """Como TabelaPrazos.consultar; None enquanto não há tabela válida"""
+        tabela = self._atual()
+        resultado = None
+        if tabela is not None:
+            resultado = tabela.consultar(data_publicacao, prazo_dias, tipo_prazo, estado, municipio)
+        if resultado is None:
+            self.falhas += 1
+        else:
+            self.acertos += 1
+        return resultado
+
+    def estatisticas(self) -> Dict:
+        tabela = self._atual() or self.construindo
+        estatisticas = tabela.estatisticas() if tabela is not None else {}
+        consultas = self.acertos + self.falhas
+        estatisticas.update({
+            'pronta': self.tabela is not None,
+            'versao': self.versao,
+            'reconstrucoes': self.reconstrucoes,
+            'acertos': self.acertos,
+            'falhas': self.falhas,
+            'taxa_acerto': self.acertos / consultas if consultas else 0.0
+        })
+        return estatisticas
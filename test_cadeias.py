@@ -0,0 +1,58 @@
+"""
+Testes das cadeias de prazos (recálculo incremental)
+Execução: python -m pytest test_cadeias.py
+"""
+
+import copy
+import unittest
+
+import prazos
+from cadeias import CarteiraPrazos, MODELO_EXEMPLO
+
+
+class TestAtualizarFeriados(unittest.TestCase):
+
+    def setUp(self):
+        self.feriados = prazos.carregar_feriados()
+
+    def _carteira(self, feriados):
+        carteira = CarteiraPrazos(feriados)
+        carteira.adicionar_caso('1', MODELO_EXEMPLO, {'citacao': '10/03/2026'}, estado='São Paulo')
+        carteira.recalcular()
+        return carteira
+
+    def _vencimento(self, carteira, etapa):
+        return carteira.resultados['1'][etapa]['data_vencimento'].strftime('%d/%m/%Y')
+
+    def test_alteracao_apos_atualizacao_sem_mudancas(self):
+        carteira = self._carteira(self.feriados)
+        self.assertEqual(self._vencimento(carteira, 'contestacao'), '31/03/2026')
+
+        carteira.atualizar_feriados(copy.deepcopy(self.feriados))
+        self.assertEqual(carteira.recalcular(), [])
+
+        novos = copy.deepcopy(self.feriados)
+        novos['nacionais'].append({'data': '16/03/2026', 'nome': 'Feriado de teste'})
+        carteira.atualizar_feriados(novos)
+        alteracoes = carteira.recalcular()
+
+        self.assertTrue(any(a['etapa'] == 'contestacao' for a in alteracoes))
+        self.assertEqual(self._vencimento(carteira, 'contestacao'), '01/04/2026')
+        self.assertEqual(carteira.resultados['1'], self._carteira(novos).resultados['1'])
+
+    def test_alteracao_em_jurisdicao_sem_calendario_em_memoria(self):
+        carteira = CarteiraPrazos(self.feriados)
+        carteira.adicionar_caso('1', MODELO_EXEMPLO, {'citacao': '10/03/2026'}, estado='São Paulo')
+        carteira.recalcular()
+        carteira.calendarios.clear()
+
+        novos = copy.deepcopy(self.feriados)
+        novos['nacionais'].append({'data': '16/03/2026', 'nome': 'Feriado de teste'})
+        carteira.atualizar_feriados(novos)
+        carteira.recalcular()
+
+        self.assertEqual(self._vencimento(carteira, 'contestacao'), '01/04/2026')
+
+
+if __name__ == '__main__':
+    unittest.main()
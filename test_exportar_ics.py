@@ -0,0 +1,66 @@
+"""
+Testes da reexportação incremental em iCalendar
+Execução: python -m pytest test_exportar_ics.py
+"""
+
+import io
+import os
+import shutil
+import tempfile
+import unittest
+
+import prazos
+from exportar_ics import EscritorICS, EstadoExportacao, exportar_prazos
+
+# Dois prazos do mesmo processo (ler_lote preenche id com a coluna processo)
+LOTE = [
+    {'id': '0001', 'data_publicacao': '10/03/2026', 'prazo': '15', 'tipo': 'uteis', 'estado': 'São Paulo'},
+    {'id': '0001', 'data_publicacao': '10/03/2026', 'prazo': '5', 'tipo': 'uteis', 'estado': 'São Paulo'},
+]
+
+
+class TestReexportacao(unittest.TestCase):
+
+    def setUp(self):
+        self.feriados = prazos.carregar_feriados()
+        self.diretorio = tempfile.mkdtemp()
+        self.caminho_estado = os.path.join(self.diretorio, 'estado')
+
+    def tearDown(self):
+        shutil.rmtree(self.diretorio)
+
+    def _exportar(self, linhas, somente_alterados=True):
+        saida = io.StringIO()
+        estado = EstadoExportacao(self.caminho_estado, 'JurisConta - Prazos')
+        try:
+            with EscritorICS(saida, 'JurisConta - Prazos', estado, somente_alterados) as escritor:
+                erros = exportar_prazos(escritor, self.feriados, [dict(l) for l in linhas])
+        finally:
+            estado.fechar()
+        return escritor, erros, saida.getvalue()
+
+    def test_prazos_do_mesmo_processo_tem_uids_distintos(self):
+        _, erros, texto = self._exportar(LOTE)
+        uids = [linha for linha in texto.splitlines() if linha.startswith('UID:')]
+        self.assertEqual(erros, [])
+        self.assertEqual(len(uids), 2)
+        self.assertEqual(len(set(uids)), 2)
+
+    def test_reexportar_mesmo_lote_nao_escreve_nada(self):
+        self._exportar(LOTE)
+        escritor, erros, texto = self._exportar(LOTE)
+        self.assertEqual(erros, [])
+        self.assertEqual(escritor.escritos, 0)
+        self.assertEqual(escritor.inalterados, 2)
+        self.assertEqual(escritor.cancelados, 0)
+        self.assertNotIn('BEGIN:VEVENT', texto)
+
+    def test_prazo_repetido_no_lote_e_recusado(self):
+        escritor, erros, _ = self._exportar(LOTE + LOTE[:1])
+        self.assertEqual(escritor.escritos, 2)
+        self.assertEqual(len(erros), 1)
+        self.assertIn('linha 3', erros[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,9 +4,16 @@ Calculadora de Prazos Processuais com interface web moderna usando Streamlit
 """
 
 import streamlit as st
-import json
-from datetime import datetime, timedelta
-from typing import Dict
+import html
+import io
+import os
+from datetime import date, datetime
+from typing import Dict, Set
+
+import exportar_ics
+import prazos
+from cache_prazos import CachePrazos, LIMITE_PADRAO
+from tabela_prazos import TabelaAtualizada, interpretar_jurisdicoes
 
 # Configuração da página
 st.set_page_config(
@@ -51,131 +58,194 @@ st.markdown("""
         .stButton>button:hover {
             background-color: #2980b9;
         }
+        .calendario-grade {
+            display: grid;
+            grid-template-columns: repeat(auto-fill, minmax(230px, 1fr));
+            gap: 1rem;
+        }
+        .calendario-mes {
+            border-collapse: collapse;
+            width: 100%;
+            font-size: 0.85rem;
+        }
+        .calendario-mes caption {
+            font-weight: bold;
+            color: #2c3e50;
+            padding-bottom: 0.3rem;
+        }
+        .calendario-mes th, .calendario-mes td {
+            text-align: center;
+            padding: 0.25rem;
+            border: 1px solid #ecf0f1;
+        }
+        .calendario-mes th { color: #7f8c8d; }
+        .cal-nao-util { background-color: #ecf0f1; color: #95a5a6; }
+        .cal-feriado { background-color: #fadbd8; color: #c0392b; }
+        .cal-suspensao { background-color: #fdebd0; color: #d35400; }
+        .cal-contado { background-color: #d6eaf8; color: #1f618d; font-weight: bold; }
+        .cal-publicacao { outline: 2px solid #7f8c8d; }
+        .cal-vencimento { background-color: #27ae60; color: white; font-weight: bold; }
     </style>
 """, unsafe_allow_html=True)
 
 
-@st.cache_data
+@st.cache_data(max_entries=1)
+def _carregar_feriados(assinatura):
+    """Feriados de uma versão do arquivo (a assinatura entra só como chave do cache)"""
+    return prazos.carregar_feriados()
+
+
 def carregar_feriados():
-    """Carrega feriados do arquivo JSON"""
-    try:
-        with open('feriados.json', 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except FileNotFoundError:
-        return {
-            'nacionais': [],
-            'moveis': [],
-            'estaduais': {},
-            'municipais': {}
-        }
+    """Carrega feriados do arquivo JSON, recarregando quando ele muda (como a tabela e o cache)"""
+    return _carregar_feriados(prazos.assinatura_arquivo())
 
 
-def calcular_pascoa(ano: int) -> datetime:
-    """Calcula data da Páscoa"""
-    a = ano % 19
-    b = ano // 100
-    c = ano % 100
-    d = b // 4
-    e = b % 4
-    f = (b + 8) // 25
-    g = (b - f + 1) // 3
-    h = (19 * a + b - d - g + 15) % 30
-    i = c // 4
-    k = c % 4
-    l = (32 + 2 * e + 2 * i - h - k) % 7
-    m = (a + 11 * h + 22 * l) // 451
-    mes = (h + l - 7 * m + 114) // 31
-    dia = ((h + l - 7 * m + 114) % 31) + 1
-    return datetime(ano, mes, dia)
-
-
-def e_feriado(feriados, data: datetime, estado: str = '', municipio: str = '') -> bool:
-    """Verifica se é feriado"""
-    data_str = data.strftime('%d/%m')
-    data_completa = data.strftime('%d/%m/%Y')
-    
-    # Verifica feriados móveis
-    for feriado in feriados.get('moveis', []):
-        if feriado.get('data') == data_completa:
-            return True
-    
-    # Verifica nacionais
-    for feriado in feriados.get('nacionais', []):
-        if feriado.get('data') == data_str:
-            return True
-    
-    # Verifica estaduais
-    if estado and estado in feriados.get('estaduais', {}):
-        for feriado in feriados['estaduais'][estado]:
-            if feriado.get('data') == data_str:
-                return True
-    
-    # Verifica municipais
-    if municipio and municipio in feriados.get('municipais', {}):
-        for feriado in feriados['municipais'][municipio]:
-            if feriado.get('data') == data_str:
-                return True
-    
-    return False
+@st.cache_resource
+def obter_cache():
+    """Cache persistente compartilhado entre workers (ativado por JURISCONTA_CACHE)"""
+    caminho = os.environ.get('JURISCONTA_CACHE')
+    if not caminho:
+        return None
+    limite = int(os.environ.get('JURISCONTA_CACHE_LIMITE', LIMITE_PADRAO))
+    return CachePrazos(caminho, limite_entradas=limite)
+
 
+@st.cache_resource
+def obter_tabela():
+    """Tabela materializada dos prazos mais comuns (ativada por JURISCONTA_TABELA)
 
-def e_dia_util(feriados, data: datetime, estado: str = '', municipio: str = '') -> bool:
-    """Verifica se é dia útil"""
-    if data.weekday() in [5, 6]:  # Sábado ou Domingo
-        return False
-    return not e_feriado(feriados, data, estado, municipio)
+    Reconstruída em segundo plano quando o feriados.json ou a data de hoje mudam.
+    """
+    if os.environ.get('JURISCONTA_TABELA', '') not in ('1', 'sim', 'true'):
+        return None
+    opcoes = {}
+    if os.environ.get('JURISCONTA_TABELA_PRAZOS'):
+        opcoes['prazos_dias'] = [int(p) for p in os.environ['JURISCONTA_TABELA_PRAZOS'].split(',')]
+    if os.environ.get('JURISCONTA_TABELA_JURISDICOES'):
+        opcoes['jurisdicoes'] = interpretar_jurisdicoes(os.environ['JURISCONTA_TABELA_JURISDICOES'])
+    if os.environ.get('JURISCONTA_TABELA_DIAS'):
+        opcoes['dias'] = int(os.environ['JURISCONTA_TABELA_DIAS'])
+    return TabelaAtualizada(**opcoes)
 
 
-def calcular_prazo(feriados, data_publicacao: str, prazo_dias: int, 
+def calcular_prazo(feriados, data_publicacao: str, prazo_dias: int,
                    tipo_prazo: str, estado: str = '', municipio: str = '') -> Dict:
-    """Calcula o prazo"""
-    try:
-        data_pub = datetime.strptime(data_publicacao, '%d/%m/%Y')
-        data_inicio = data_pub + timedelta(days=1)
-        
-        # Ajusta para primeiro dia útil
-        while not e_dia_util(feriados, data_inicio, estado, municipio):
-            data_inicio += timedelta(days=1)
-        
-        data_vencimento = data_inicio
-        
-        if tipo_prazo == 'uteis':
-            dias_contados = 0
-            while dias_contados < prazo_dias:
-                if e_dia_util(feriados, data_vencimento, estado, municipio):
-                    dias_contados += 1
-                if dias_contados < prazo_dias:
-                    data_vencimento += timedelta(days=1)
-        else:
-            data_vencimento += timedelta(days=prazo_dias - 1)
-            while not e_dia_util(feriados, data_vencimento, estado, municipio):
-                data_vencimento += timedelta(days=1)
-        
-        hoje = datetime.now().date()
-        dias_restantes = (data_vencimento.date() - hoje).days
-        
-        dias = ['segunda-feira', 'terça-feira', 'quarta-feira', 
-                'quinta-feira', 'sexta-feira', 'sábado', 'domingo']
-        
-        status = ''
-        if dias_restantes < 0:
-            status = 'VENCIDO'
-        elif dias_restantes == 0:
-            status = 'VENCE HOJE'
-        elif dias_restantes <= 3:
-            status = 'VENCE EM BREVE'
+    """Calcula o prazo pela tabela materializada, pelo cache persistente ou pelo motor"""
+    tabela = obter_tabela()
+    if tabela is not None:
+        resultado = tabela.consultar(data_publicacao, int(prazo_dias), tipo_prazo, estado, municipio)
+        if resultado is not None:
+            return resultado
+    
+    cache = obter_cache()
+    if cache is not None:
+        return cache.calcular_prazo(data_publicacao, prazo_dias, tipo_prazo, estado, municipio)
+    return prazos.calcular_prazo(feriados, data_publicacao, prazo_dias, tipo_prazo, estado, municipio)
+
+
+def gerar_ics_prazo(feriados, data_pub: str, prazo_dias: int, tipo: str,
+                    estado: str = '', municipio: str = '') -> str:
+    """Arquivo .ics com o vencimento do prazo calculado"""
+    saida = io.StringIO(newline='')
+    with exportar_ics.EscritorICS(saida, 'JurisConta - Prazos') as escritor:
+        exportar_ics.exportar_prazos(escritor, feriados, [{
+            'data_publicacao': data_pub,
+            'prazo': prazo_dias,
+            'tipo': tipo,
+            'estado': estado,
+            'municipio': municipio
+        }])
+    return saida.getvalue()
+
+
+def gerar_ics_calendario(feriados, ano: int, estado: str = '', municipio: str = '') -> str:
+    """Arquivo .ics com os feriados e suspensões da jurisdição no ano"""
+    saida = io.StringIO(newline='')
+    nome = ' - '.join(p for p in (municipio, estado) if p) or 'Nacional'
+    with exportar_ics.EscritorICS(saida, f'JurisConta - {nome}') as escritor:
+        exportar_ics.exportar_calendario(escritor, feriados, ano, ano, estado, municipio)
+    return saida.getvalue()
+
+
+def renderizar_mes_html(ano: int, mes: int, nao_uteis: Dict[date, Dict],
+                        contados: Set[date], data_pub: date, data_venc: date) -> str:
+    """Monta a tabela HTML de um mês destacando os dias contados do prazo"""
+    cabecalho = ''.join(f'<th>{d}</th>' for d in ['D', 'S', 'T', 'Q', 'Q', 'S', 'S'])
+    linhas = []
+    for semana in prazos.grade_mes(ano, mes):
+        celulas = []
+        for dia in semana:
+            if dia is None:
+                celulas.append('<td></td>')
+                continue
+            classes = []
+            info = nao_uteis.get(dia)
+            if dia == data_venc:
+                classes.append('cal-vencimento')
+            elif dia in contados:
+                classes.append('cal-contado')
+            elif info:
+                classes.append({'feriado': 'cal-feriado', 'suspensao': 'cal-suspensao'}
+                               .get(info['tipo'], 'cal-nao-util'))
+            if dia == data_pub:
+                classes.append('cal-publicacao')
+            atributos = f' class="{" ".join(classes)}"' if classes else ''
+            if info:
+                atributos += f' title="{html.escape(info["motivo"])}"'
+            celulas.append(f'<td{atributos}>{dia.day}</td>')
+        linhas.append(f"<tr>{''.join(celulas)}</tr>")
+
+    return (f'<table class="calendario-mes"><caption>{prazos.MESES[mes - 1]} {ano}</caption>'
+            f'<tr>{cabecalho}</tr>{"".join(linhas)}</table>')
+
+
+def exibir_calendario(feriados, data_pub: str, resultado: Dict, tipo: str,
+                      estado: str = '', municipio: str = ''):
+    """Exibe a visão mensal e anual do prazo, com os dias não úteis e seus motivos"""
+    pub = datetime.strptime(data_pub, '%d/%m/%Y').date()
+    inicio = datetime.strptime(resultado['data_inicio'], '%d/%m/%Y').date()
+    venc = datetime.strptime(resultado['data_vencimento'], '%d/%m/%Y').date()
+
+    # Uma única consulta cobre o ano do vencimento e todo o período do prazo
+    calendario = prazos.Calendario(feriados, estado, municipio)
+    primeiro = min(pub, date(venc.year, 1, 1))
+    nao_uteis = {d['data']: d for d in calendario.dias_nao_uteis(primeiro, date(venc.year, 12, 31))}
+    contados = set(prazos.dias_contados(inicio, venc, tipo, nao_uteis))
+
+    meses = []
+    ano, mes = pub.year, pub.month
+    while (ano, mes) <= (venc.year, venc.month):
+        meses.append((ano, mes))
+        ano, mes = (ano + 1, 1) if mes == 12 else (ano, mes + 1)
+
+    legenda = ('<p><span class="cal-contado">&nbsp;dia contado&nbsp;</span> '
+               '<span class="cal-vencimento">&nbsp;vencimento&nbsp;</span> '
+               '<span class="cal-feriado">&nbsp;feriado&nbsp;</span> '
+               '<span class="cal-suspensao">&nbsp;suspensão&nbsp;</span> '
+               '<span class="cal-nao-util">&nbsp;fim de semana&nbsp;</span></p>')
+
+    aba_mes, aba_ano, aba_motivos = st.tabs(["📅 Meses do Prazo", f"🗓️ Ano {venc.year}", "📋 Dias Não Úteis"])
+    with aba_mes:
+        grade = ''.join(renderizar_mes_html(a, m, nao_uteis, contados, pub, venc) for a, m in meses)
+        st.markdown(legenda + f'<div class="calendario-grade">{grade}</div>', unsafe_allow_html=True)
+    with aba_ano:
+        grade = ''.join(renderizar_mes_html(venc.year, m, nao_uteis, contados, pub, venc)
+                        for m in range(1, 13))
+        st.markdown(legenda + f'<div class="calendario-grade">{grade}</div>', unsafe_allow_html=True)
+    with aba_motivos:
+        periodo = [d for d in nao_uteis.values() if pub < d['data'] <= venc]
+        if periodo:
+            st.table([{'Data': d['data'].strftime('%d/%m/%Y'),
+                       'Dia': prazos.obter_dia_semana(d['data']).title(),
+                       'Motivo': d['motivo']} for d in periodo])
         else:
-            status = 'DENTRO DO PRAZO'
-        
-        return {
-            'data_inicio': data_inicio.strftime('%d/%m/%Y'),
-            'data_vencimento': data_vencimento.strftime('%d/%m/%Y'),
-            'dia_semana': dias[data_vencimento.weekday()],
-            'dias_restantes': dias_restantes,
-            'status': status
-        }
-    except ValueError:
-        return {'erro': 'Data inválida. Use o formato dd/mm/aaaa'}
+            st.info("Nenhum dia não útil no período do prazo.")
+        st.download_button(
+            f"📤 Exportar feriados de {venc.year} (.ics)",
+            data=gerar_ics_calendario(feriados, venc.year, estado, municipio),
+            file_name=f"feriados-{venc.year}.ics",
+            mime="text/calendar"
+        )
 
 
 def main():
@@ -202,6 +272,22 @@ def main():
         st.metric("Estados Cadastrados", f"{stats['estados']}/26")
         st.metric("Municípios Cadastrados", stats['municipios'])
         
+        tabela = obter_tabela()
+        if tabela is not None:
+            est_tabela = tabela.estatisticas()
+            st.metric("Acertos na Tabela", f"{est_tabela['taxa_acerto'] * 100:.1f}%",
+                      help=f"{est_tabela['combinacoes']} combinações, "
+                           f"{est_tabela['memoria_bytes'] / 1024:.0f} KB, "
+                           f"publicações de {est_tabela['publicacoes']}"
+                           + ("" if est_tabela['pronta'] else " (em construção)"))
+        
+        cache = obter_cache()
+        if cache is not None:
+            est_cache = cache.estatisticas()
+            st.metric("Acertos no Cache", f"{est_cache['taxa_acerto_total'] * 100:.1f}%",
+                      help=f"{est_cache['entradas']} resultados armazenados "
+                           f"(limite {est_cache['limite_entradas']})")
+        
         st.markdown("---")
         st.info("ℹ️ Baseado no CPC, Art. 216 - Contagem de prazos")
     
@@ -285,6 +371,17 @@ def main():
                     st.error(f"⚠️ ATENÇÃO: O prazo venceu há {abs(resultado['dias_restantes'])} dias!")
                 elif resultado['dias_restantes'] <= 3:
                     st.warning("⚠️ ATENÇÃO: Prazo vencendo em breve!")
+                
+                st.download_button(
+                    "📤 Exportar para o calendário (.ics)",
+                    data=gerar_ics_prazo(feriados, data_pub, prazo_dias, tipo, estado, municipio),
+                    file_name=f"prazo-{resultado['data_vencimento'].replace('/', '-')}.ics",
+                    mime="text/calendar"
+                )
+                
+                st.markdown("---")
+                st.header("📅 Calendário")
+                exibir_calendario(feriados, data_pub, resultado, tipo, estado, municipio)
     
     with col2:
         st.header("ℹ️ Informações")